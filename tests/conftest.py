@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope="session")
+def yf(tmp_path_factory):
+    """출석 스크립트 모듈 (로그/기록 파일이 저장소 대신 임시 폴더에 생기도록 불러옴)"""
+    workdir = tmp_path_factory.mktemp("yesfile")
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import yesfile_attendance_improved
+    finally:
+        os.chdir(previous)
+    return yesfile_attendance_improved
+
+
+@pytest.fixture(autouse=True)
+def _isolated_workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
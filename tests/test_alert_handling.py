@@ -0,0 +1,96 @@
+import pytest
+from selenium.common.exceptions import NoAlertPresentException, UnexpectedAlertPresentException
+
+DONE_MESSAGE = "출석체크 완료! 포인트가 적립되었습니다."
+
+
+class FakeAlert:
+    def __init__(self, driver):
+        self.driver = driver
+        self.text = driver.alert_text
+
+    def accept(self):
+        self.driver.alert_text = None
+
+
+class FakeButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.alert_text = DONE_MESSAGE
+
+
+class AlertDriver:
+    """unhandledPromptBehavior=ignore처럼 알림창이 열린 동안 모든 스크립트가 실패하는 드라이버"""
+
+    current_url = "http://stub.invalid/event"
+
+    def __init__(self, yf):
+        self.yf = yf
+        self.alert_text = None
+        self.button = FakeButton(self)
+
+    @property
+    def switch_to(self):
+        return self
+
+    @property
+    def alert(self):
+        if self.alert_text is None:
+            raise NoAlertPresentException()
+        return FakeAlert(self)
+
+    def execute_script(self, script, *args):
+        if self.alert_text is not None:
+            raise UnexpectedAlertPresentException(alert_text=self.alert_text)
+        if script == self.yf.MULTI_LOCATOR_SCRIPT:
+            return [0, self.button]
+        if script == self.yf.PAGE_CLASSIFIER_SCRIPT:
+            return {"url": self.current_url, "logout": True, "point": False, "password_field": False, "text": ""}
+        if script == self.yf.PAGE_METRICS_SCRIPT:
+            return {"bytes": 0, "requests": 0, "load_ms": None}
+        if "getBoundingClientRect" in script:
+            return [0, 0, 100, 30]
+        if "readyState" in script:
+            return "complete"
+        return True
+
+    def get(self, url):
+        if self.alert_text is not None:
+            raise UnexpectedAlertPresentException(alert_text=self.alert_text)
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def get_cookies(self):
+        return []
+
+
+@pytest.fixture(autouse=True)
+def _quiet(yf, monkeypatch):
+    monkeypatch.setenv("YESFILE_DEBUG_CAPTURE", "off")
+    monkeypatch.setattr(yf, "_step_timeouts", None)
+
+
+def test_alert_after_attendance_click_is_read_and_closed(yf):
+    driver = AlertDriver(yf)
+    yf.reset_failure()
+
+    assert yf.check_attendance(driver, [yf.EVENT_URLS[0]]) is True
+    assert yf.get_failure() is None
+    assert not yf.is_unverified()
+    assert driver.alert_text is None
+
+
+def test_navigate_closes_alert_and_keeps_text(yf):
+    driver = AlertDriver(yf)
+
+    def open_alert_on_load(url):
+        driver.alert_text = "로그인이 필요합니다."
+
+    driver.get = open_alert_on_load
+    yf.navigate(driver, "http://stub.invalid/mypage", "session_probe")
+
+    assert driver.alert_text is None
+    assert yf._pop_alert_text(driver) == "로그인이 필요합니다."
@@ -0,0 +1,31 @@
+import re
+
+import pytest
+
+
+def cdp_blocked(patterns, url):
+    """Network.setBlockedURLs와 같은 방식으로 비교 ('*'만 와일드카드)"""
+    for pattern in patterns:
+        regex = "^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$"
+        if re.match(regex, url):
+            return True
+    return False
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.yesfile.com/img/logo.png",
+    "https://www.yesfile.com/img/logo.png?v=3",
+    "https://www.yesfile.com/font/nanum.woff2?ver=1",
+])
+def test_static_resources_are_blocked(yf, url):
+    assert cdp_blocked(yf.BLOCKED_RESOURCE_PATTERNS, url)
+
+
+@pytest.mark.parametrize("url", [
+    "https://www.yesfile.com/js/snap.svg-min.js",
+    "https://www.yesfile.com/js/jquery.gifplayer.js",
+    "https://www.yesfile.com/js/jquery.icons.js?v=2",
+    "https://www.yesfile.com/css/common.css?v=1",
+])
+def test_first_party_scripts_and_css_are_kept(yf, url):
+    assert not cdp_blocked(yf.BLOCKED_RESOURCE_PATTERNS, url)
@@ -0,0 +1,68 @@
+import pytest
+from selenium.common.exceptions import NoAlertPresentException
+
+
+class ProbeDriver:
+    """세션 확인 페이지(/mypage)를 주어진 상태로 보여 주는 드라이버"""
+
+    def __init__(self, yf, logout=False, point=False):
+        self.yf = yf
+        self.current_url = "http://stub.invalid/mypage"
+        self.signals = {"url": self.current_url, "logout": logout, "point": point, "password_field": False, "text": ""}
+        self.cookies_cleared = False
+
+    @property
+    def switch_to(self):
+        return self
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException()
+
+    def execute_script(self, script, *args):
+        if script == self.yf.PAGE_CLASSIFIER_SCRIPT:
+            return dict(self.signals)
+        if script == self.yf.PAGE_METRICS_SCRIPT:
+            return {"bytes": 0, "requests": 0, "load_ms": None}
+        if "readyState" in script:
+            return "complete"
+        return True
+
+    def get(self, url):
+        pass
+
+    def add_cookie(self, cookie):
+        pass
+
+    def get_cookies(self):
+        return [{"name": "YF_SESSION", "value": "abc"}]
+
+    def delete_all_cookies(self):
+        self.cookies_cleared = True
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _cached_session(yf, monkeypatch):
+    monkeypatch.setattr(yf, "_step_timeouts", None)
+    yf.save_session(ProbeDriver(yf), "user1", 600)
+    assert "user1" in yf._load_session_cache()
+
+
+def test_page_without_login_marker_is_not_a_session(yf):
+    # 404나 "로그인 후 이용" 안내처럼 URL에 login이 없고 비밀번호 칸도 없는 화면
+    driver = ProbeDriver(yf)
+
+    assert yf.restore_session(driver, "user1") is False
+    assert "user1" not in yf._load_session_cache()
+    assert driver.cookies_cleared
+
+
+@pytest.mark.parametrize("signal", ["logout", "point"])
+def test_login_marker_reuses_session(yf, signal):
+    driver = ProbeDriver(yf, **{signal: True})
+
+    assert yf.restore_session(driver, "user1") is True
+    assert "user1" in yf._load_session_cache()
@@ -0,0 +1,168 @@
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+
+class StubDriver:
+    """페이지에 아무 요소도 없는 드라이버 (execute_script는 항상 None)"""
+
+    current_url = "http://stub.invalid/login"
+
+    def __init__(self):
+        self.script_calls = 0
+        self.visited = []
+        self.page_load_timeouts = []
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        return None
+
+    def find_elements(self, by, value):
+        return []
+
+    def get_cookies(self):
+        return []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def set_page_load_timeout(self, timeout):
+        self.page_load_timeouts.append(timeout)
+
+
+LOCATORS = [(By.ID, "userid"), (By.CSS_SELECTOR, "#attendroulette > button")]
+
+
+@pytest.fixture(autouse=True)
+def _default_timeouts(yf, monkeypatch):
+    for name in ("YESFILE_TIMEOUTS", "YESFILE_MAX_WAIT", "YESFILE_RUN_BUDGET"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(yf, "_step_timeouts", None)
+
+
+def elapsed(func, *args, **kwargs):
+    started = time.monotonic()
+    result = func(*args, **kwargs)
+    return result, time.monotonic() - started
+
+
+def test_default_step_timeouts(yf):
+    assert yf.step_timeout("find_button") == 5
+    assert yf.step_timeout("find_field") == 15
+
+
+@pytest.mark.parametrize("step, seconds", [("find_button", 0.4), ("find_field", 0.8)])
+def test_find_miss_waits_only_for_step_timeout(yf, monkeypatch, step, seconds):
+    monkeypatch.setenv("YESFILE_TIMEOUTS", f"{step}={seconds}")
+    driver = StubDriver()
+
+    (element, found), took = elapsed(
+        yf.find_with_stats, driver, f"{step}:test", LOCATORS, timeout=yf.step_timeout(step)
+    )
+
+    assert element is None and found is None
+    assert seconds <= took < seconds + 0.5
+    assert driver.script_calls > 1  # 바로 한 번 확인한 뒤 대기 시간 안에서 다시 확인
+
+
+def test_budget_timeout_caps_to_max_wait_and_budget(yf, monkeypatch):
+    monkeypatch.setenv("YESFILE_MAX_WAIT", "7")
+    assert yf.budget_timeout(100) == 7
+    assert yf.budget_timeout() == 7
+    assert yf.budget_timeout(100, cap=False) == 100
+    assert yf.budget_timeout(3) == 3
+
+    with yf.run_budget(2):
+        assert yf.budget_timeout(100) <= 2
+        assert yf.budget_timeout(100, cap=False) <= 2
+
+
+def test_find_under_small_budget_returns_when_budget_runs_out(yf):
+    driver = StubDriver()
+    with yf.run_budget(0.3):
+        (element, found), took = elapsed(yf.find_first_clickable, driver, LOCATORS, timeout=5)
+
+    assert element is None and found is None
+    assert took < 0.7
+
+
+def test_exhausted_budget_returns_at_once(yf):
+    driver = StubDriver()
+    with yf.run_budget(0):
+        (element, _), find_took = elapsed(yf.find_first_clickable, driver, LOCATORS, timeout=5)
+        calls = driver.script_calls
+        ready, wait_took = elapsed(yf.wait_for_dom_ready, driver, 5)
+
+    assert element is None
+    assert find_took < 0.2
+    assert ready is False and wait_took < 0.1
+    assert driver.script_calls == calls  # 예산이 없으면 조건을 확인하지도 않음
+
+
+def test_navigate_raises_budget_exhausted(yf):
+    driver = StubDriver()
+    with yf.run_budget(0):
+        with pytest.raises(yf.BudgetExhausted):
+            yf.navigate(driver, "http://stub.invalid/event", "event")
+
+    assert issubclass(yf.BudgetExhausted, TimeoutException)
+    assert driver.visited == []
+
+
+def test_page_load_timeout_follows_budget(yf):
+    driver = StubDriver()
+    with yf.run_budget(10):
+        yf.apply_page_load_budget(driver)
+        yf.apply_page_load_budget(driver)
+
+    assert driver.page_load_timeouts == [9]  # 남은 예산(초 단위 내림), 같은 값은 다시 설정하지 않음
+
+
+def test_submit_form_without_form_does_not_wait(yf):
+    driver = StubDriver()
+    result, took = elapsed(yf._submit_form, driver, None)
+
+    assert result is False
+    assert took < 0.1
+    assert driver.script_calls == 0
+
+
+class RecordingChrome:
+    """webdriver.Chrome 대신 생성되어 타임아웃 설정 호출을 기록"""
+
+    instances = []
+
+    def __init__(self, service=None, options=None):
+        self.options = options
+        self.implicit_waits = []
+        self.page_load_timeouts = []
+        RecordingChrome.instances.append(self)
+
+    def implicitly_wait(self, seconds):
+        self.implicit_waits.append(seconds)
+
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeouts.append(seconds)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+
+def test_setup_driver_turns_off_implicit_wait(yf, monkeypatch):
+    RecordingChrome.instances.clear()
+    monkeypatch.delenv("YESFILE_BROWSER_PROFILE", raising=False)
+    monkeypatch.setattr(yf, "resolve_chromedriver", lambda: "chromedriver")
+    monkeypatch.setattr(yf, "Service", lambda path: None)
+    monkeypatch.setattr(yf.webdriver, "Chrome", RecordingChrome)
+
+    driver = yf.setup_driver()
+
+    assert driver is RecordingChrome.instances[0]
+    assert driver.implicit_waits == [0]
+    assert driver.page_load_timeouts == [yf.PAGE_LOAD_TIMEOUT]
+    assert driver.options.to_capabilities()["unhandledPromptBehavior"] == "ignore"
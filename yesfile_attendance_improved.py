@@ -2,22 +2,47 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, UnexpectedAlertPresentException, NoAlertPresentException
 from webdriver_manager.chrome import ChromeDriverManager
 import time
 import os
 import logging
 import getpass
 import traceback
+import csv
+import queue
+import threading
+import json
+import math
+import sqlite3
+import multiprocessing
+import hashlib
+import socket
+import glob
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import secrets
+from collections import deque
+import re
+import shutil
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import requests
+from requests.adapters import HTTPAdapter
 
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s',
     handlers=[
         logging.FileHandler('yesfile_attendance.log', encoding='utf-8'),
         logging.StreamHandler()
@@ -25,16 +50,437 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 예스파일 주소 (YESFILE_BASE_URL로 로컬 테스트 서버 지정 가능)
+BASE_URL = os.environ.get('YESFILE_BASE_URL', "https://www.yesfile.com").rstrip("/")
+LOGIN_URL = f"{BASE_URL}/login"
+
+# 로그인/출석 결과 판단 문구
+LOGOUT_INDICATORS = ["로그아웃", "logout"]
+LOGIN_ERROR_INDICATORS = [
+    "로그인 실패", "아이디를 확인", "비밀번호를 확인", "login failed"
+]
+ALREADY_ATTENDED_MESSAGES = ["이미 출석", "already attended"]
+ATTENDANCE_SUCCESS_MESSAGES = [
+    "출석완료", "출석체크 완료", "포인트가 적립",
+    "attendance complete", "출석 성공"
+]
+
+# 로그인 세션(쿠키) 캐시 설정
+SESSION_CACHE_FILE = os.environ.get('YESFILE_SESSION_CACHE', 'yesfile_session_cache.json')
+SESSION_PROBE_URL = os.environ.get('YESFILE_SESSION_PROBE_URL', f"{BASE_URL}/mypage")
+DEFAULT_SESSION_TTL = 6 * 60 * 60  # 초 단위, YESFILE_SESSION_TTL로 변경 (0이면 캐시 사용 안 함)
+_session_cache_lock = threading.Lock()
+
+# === 단계별 시간 측정 및 실행 보고서 ===
+
+# 실행 보고서 (로그 파일 옆에 JSON으로 저장, YESFILE_REPORT_FILE로 변경)
+REPORT_FILE = os.environ.get('YESFILE_REPORT_FILE', 'yesfile_attendance_report.json')
+
+_spans = []
+_spans_lock = threading.Lock()
+_span_context = threading.local()
+
+@contextmanager
+def account_context(username):
+    """이 스레드에서 기록되는 구간에 계정 이름 연결"""
+    previous = getattr(_span_context, "account", None)
+    _span_context.account = username
+    try:
+        yield
+    finally:
+        _span_context.account = previous
+
+@contextmanager
+def span(step, **attrs):
+    """구간 시간과 결과 기록 (yield된 dict의 outcome 등을 호출 측에서 갱신)"""
+    record = {
+        "step": step,
+        "account": getattr(_span_context, "account", None),
+        "started_at": time.time(),
+        "outcome": "ok",
+        **attrs,
+    }
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["outcome"] = "error"
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        record["duration"] = round(time.perf_counter() - started, 3)
+        with _spans_lock:
+            _spans.append(record)
+
+def _percentile(sorted_values, pct):
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize_spans(spans):
+    """단계별 횟수, p50/p95/최대 시간, 결과 분포"""
+    by_step = {}
+    for record in spans:
+        by_step.setdefault(record["step"], []).append(record)
+
+    summary = {}
+    for step, records in sorted(by_step.items()):
+        durations = sorted(r["duration"] for r in records)
+        outcomes = {}
+        for r in records:
+            outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+        summary[step] = {
+            "count": len(records),
+            "p50": _percentile(durations, 50),
+            "p95": _percentile(durations, 95),
+            "max": durations[-1],
+            "total": round(sum(durations), 3),
+            "outcomes": outcomes,
+        }
+    return summary
+
+def write_run_report(results, extra=None):
+    """구간 기록과 요약(과 extra 항목)을 JSON 보고서로 저장하고 요약을 로그로 출력"""
+    with _spans_lock:
+        spans = list(_spans)
+    summary = summarize_spans(spans)
+
+    logger.info("=== 단계별 소요 시간 (p50 / p95 / 최대, 초) ===")
+    for step, stats in summary.items():
+        logger.info(
+            f"{step}: {stats['count']}회, {stats['p50']:.2f} / {stats['p95']:.2f} / {stats['max']:.2f}, "
+            f"결과 {stats['outcomes']}"
+        )
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+        "summary": summary,
+        **(extra or {}),
+        "spans": spans,
+    }
+    try:
+        with open(REPORT_FILE, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logger.info(f"실행 보고서 저장: {REPORT_FILE}")
+    except OSError as e:
+        logger.warning(f"실행 보고서 저장 실패: {e}")
+    return report
+
+# === 실패 원인 분류 ===
+
+ERROR_DRIVER_CRASH = "driver_crash"
+ERROR_TIMEOUT = "timeout"
+ERROR_SELECTOR_MISS = "selector_miss"
+ERROR_AUTH = "auth"  # 아이디/비밀번호 오류 - 재시도해도 소용없음
+ERROR_UNKNOWN = "unknown"
+ERROR_CIRCUIT_OPEN = "circuit_open"  # 사이트 장애 의심으로 실행하지 않고 보류
+RETRYABLE_ERRORS = {ERROR_DRIVER_CRASH, ERROR_TIMEOUT, ERROR_SELECTOR_MISS, ERROR_UNKNOWN, ERROR_CIRCUIT_OPEN}
+
+# 실패 위치 (차단기가 같은 종류의 연속 실패를 판단할 때 사용)
+FAILURE_PAGE_LOAD = "page_load"
+FAILURE_LOGIN_FIELD = "login_field"
+FAILURE_ATTENDANCE_BUTTON = "attendance_button"
+
+_failure_local = threading.local()
+
+def reset_failure():
+    """계정 처리 시작 시 실패 원인 초기화"""
+    _failure_local.kind = None
+    _failure_local.detail = None
+    _failure_local.unverified = False
+
+def mark_failure(kind, detail=None):
+    """이 스레드에서 처리 중인 계정의 실패 원인 기록 (처음 기록된 원인 유지)"""
+    if getattr(_failure_local, "kind", None) is None:
+        _failure_local.kind = kind
+        _failure_local.detail = detail
+
+def get_failure():
+    """기록된 실패 원인 (없으면 None)"""
+    return getattr(_failure_local, "kind", None)
+
+def get_failure_detail():
+    """기록된 실패 위치 (없으면 None)"""
+    return getattr(_failure_local, "detail", None)
+
+def mark_unverified():
+    """출석 버튼은 눌렀지만 완료 문구를 확인하지 못했음을 기록"""
+    _failure_local.unverified = True
+
+def is_unverified():
+    return getattr(_failure_local, "unverified", False)
+
+# === 크롬 드라이버 캐시 ===
+
+# 크롬 버전별 드라이버 보관 위치 (YESFILE_DRIVER_CACHE로 변경)
+DRIVER_CACHE_DIR = os.environ.get(
+    'YESFILE_DRIVER_CACHE',
+    os.path.join(os.path.expanduser("~"), ".cache", "yesfile-attendance", "drivers")
+)
+CHROME_BINARY_CANDIDATES = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+# 드라이버 기본 타임아웃 (초)
+IMPLICIT_WAIT = 0  # 암묵적 대기는 끄고 모든 대기는 예산(단계별 시간)이 있는 명시적 대기로
+PAGE_LOAD_TIMEOUT = 40
+
+_resolved_driver_path = None
+_driver_startup_times = []
+_driver_metrics_lock = threading.Lock()
+
+@contextmanager
+def file_lock(lock_path, timeout=120, stale_after=600):
+    """잠금 파일로 프로세스 간 상호 배제 (오래된 잠금 파일은 제거)"""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.time() > deadline:
+                raise TimeoutError(f"잠금 대기 시간 초과: {lock_path}")
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+def detect_chrome_version():
+    """설치된 크롬 버전 확인 (확인 불가 시 None)"""
+    if os.name == "nt":
+        commands = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+    else:
+        commands = [[binary, "--version"] for binary in CHROME_BINARY_CANDIDATES]
+
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+)\.\d+\.\d+\.\d+", output)
+        if match:
+            return match.group(0)
+    return None
+
+def _load_driver_registry(registry_path):
+    """드라이버 등록 정보 읽기"""
+    try:
+        with open(registry_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def resolve_chromedriver():
+    """크롬 버전에 맞는 캐시된 드라이버 경로 (최초 1회만 webdriver-manager 사용)"""
+    global _resolved_driver_path
+    if _resolved_driver_path and os.path.exists(_resolved_driver_path):
+        return _resolved_driver_path
+
+    os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+    registry_path = os.path.join(DRIVER_CACHE_DIR, "registry.json")
+
+    chrome_version = detect_chrome_version()
+    major = chrome_version.split(".")[0] if chrome_version else None
+
+    with file_lock(registry_path + ".lock"):
+        registry = _load_driver_registry(registry_path)
+        entries = {k: v for k, v in registry.items() if os.path.exists(v.get("path", ""))}
+
+        if major and major in entries:
+            entry = entries[major]
+        elif not major and entries:
+            # 크롬 버전을 알 수 없으면(오프라인 등) 가장 최근 드라이버 사용
+            entry = max(entries.values(), key=lambda e: e.get("saved_at", 0))
+        else:
+            entry = None
+
+        if entry:
+            logger.info(f"캐시된 크롬 드라이버 사용: {entry['path']} (크롬 {entry.get('chrome_version')})")
+        else:
+            logger.info(f"크롬 {chrome_version or '버전 미확인'}용 드라이버를 내려받아 캐시에 저장합니다.")
+            source_path = ChromeDriverManager().install()
+            target_dir = os.path.join(DRIVER_CACHE_DIR, major or "unknown")
+            os.makedirs(target_dir, exist_ok=True)
+            target_path = os.path.join(target_dir, os.path.basename(source_path))
+            shutil.copy2(source_path, target_path)
+            os.chmod(target_path, 0o755)
+
+            entry = {"path": target_path, "chrome_version": chrome_version, "saved_at": time.time()}
+            registry[major or "unknown"] = entry
+            tmp_path = registry_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(registry, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, registry_path)
+
+    _resolved_driver_path = entry["path"]
+    return _resolved_driver_path
+
+def record_driver_startup(resolve_seconds, total_seconds):
+    """드라이버 시작 시간 기록 및 로그"""
+    with _driver_metrics_lock:
+        _driver_startup_times.append(total_seconds)
+    logger.info(
+        f"드라이버 시작 시간: {total_seconds:.2f}초 "
+        f"(드라이버 확인 {resolve_seconds:.2f}초, 브라우저 실행 {total_seconds - resolve_seconds:.2f}초)"
+    )
+
+# === 요청 차단 프로필 ===
+
+# 확장자 기준 차단 (이미지, 미디어, 폰트) - 1st party 스크립트/CSS는 유지
+# 확장자마다 "*.png"와 쿼리 문자열이 붙은 "*.png?*" 두 패턴 (snap.svg-min.js 같은 스크립트는 제외)
+BLOCKED_RESOURCE_EXTENSIONS = [
+    "png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "mp3", "m4a", "ogg",
+]
+BLOCKED_RESOURCE_PATTERNS = [
+    pattern for ext in BLOCKED_RESOURCE_EXTENSIONS for pattern in (f"*.{ext}", f"*.{ext}?*")
+]
+# 광고/트래커 도메인 (YESFILE_BLOCK_DOMAINS로 추가, YESFILE_ALLOW_DOMAINS로 제외)
+BLOCKED_THIRD_PARTY_DOMAINS = [
+    "doubleclick.net", "google-analytics.com", "googletagmanager.com", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "facebook.net", "connect.facebook.net",
+    "wcs.naver.net", "criteo.com", "criteo.net", "scorecardresearch.com", "mobon.net", "dable.io",
+]
+BLOCKING_CHROME_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+# 현재 페이지의 전송량/로드 시간 측정
+PAGE_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0),
+    load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd - nav.startTime : null,
+    dom_ms: nav ? nav.domContentLoadedEventEnd - nav.startTime : null
+};
+"""
+
+def get_block_profile():
+    """요청 차단 프로필 (YESFILE_BLOCK_PROFILE: off / media / ads, 기본 ads = media + 광고 도메인)"""
+    profile = os.environ.get('YESFILE_BLOCK_PROFILE', 'ads').lower()
+    return profile if profile in ("off", "media", "ads") else "ads"
+
+def _env_list(name):
+    """쉼표로 구분된 환경변수 목록"""
+    return [item.strip() for item in os.environ.get(name, "").split(",") if item.strip()]
+
+def get_blocked_url_patterns():
+    """CDP Network.setBlockedURLs에 넘길 패턴 목록"""
+    profile = get_block_profile()
+    if profile == "off":
+        return []
+
+    patterns = list(BLOCKED_RESOURCE_PATTERNS)
+    if profile == "ads":
+        allowed = _env_list('YESFILE_ALLOW_DOMAINS')
+        domains = BLOCKED_THIRD_PARTY_DOMAINS + _env_list('YESFILE_BLOCK_DOMAINS')
+        patterns += [f"*{domain}*" for domain in domains if domain not in allowed]
+    return patterns
+
+def apply_network_profile(driver):
+    """현재 탭에 요청 차단 적용 (새 탭마다 다시 호출해야 함)"""
+    patterns = get_blocked_url_patterns()
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.debug(f"요청 차단 적용: 패턴 {len(patterns)}개 ({get_block_profile()})")
+    except Exception as e:
+        logger.warning(f"요청 차단 설정 실패: {e}")
+
+def report_page_metrics(driver, label):
+    """페이지 전송량과 로드 시간 기록 (차단 목록 조정용)"""
+    try:
+        metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+    except Exception as e:
+        logger.debug(f"페이지 측정 실패 ({label}): {e}")
+        return None
+
+    load_ms = metrics.get("load_ms")
+    load = f"{load_ms:.0f}ms" if load_ms is not None else "측정 불가"
+    logger.info(
+        f"페이지 로드 [{label}]: {metrics['bytes'] / 1024:.1f}KB, "
+        f"요청 {metrics['requests']}개, 로드 {load} (차단 프로필: {get_block_profile()})"
+    )
+    return metrics
+
+def apply_driver_timeouts(driver):
+    """드라이버 타임아웃을 기본값으로 설정"""
+    driver.implicitly_wait(IMPLICIT_WAIT)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.yesfile_page_load_timeout = PAGE_LOAD_TIMEOUT
+
+# === 브라우저 실행 프로필 ===
+
+# lean 프로필: 백그라운드 작업/부가 기능을 끄고 렌더러를 하나로 제한 (브라우저당 메모리 절감)
+LEAN_CHROME_ARGUMENTS = [
+    "--headless=new",
+    "--window-size=800,600",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+    "--renderer-process-limit=1",
+    # 사이트 격리를 끄지 않으면 교차 사이트 iframe마다 렌더러가 새로 뜸
+    "--disable-features=Translate,OptimizationHints,MediaRouter,IsolateOrigins,site-per-process",
+]
+
+def get_browser_profile():
+    """브라우저 실행 프로필 (YESFILE_BROWSER_PROFILE: default / lean)"""
+    profile = os.environ.get('YESFILE_BROWSER_PROFILE', 'default').lower()
+    return profile if profile in ("default", "lean") else "default"
+
+def _make_profile_dir():
+    """tmpfs(/dev/shm)에 일회용 사용자 데이터 폴더 생성 (쓸 수 없으면 시스템 임시 폴더)"""
+    root = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+    return tempfile.mkdtemp(prefix="yesfile-chrome-", dir=root)
+
 def setup_driver():
     """크롬 드라이버 설정 (JavaScript 활성화)"""
     chrome_options = Options()
-    
-    # GitHub Actions 환경 감지
+    profile = get_browser_profile()
+    profile_dir = None
+
+    # GitHub Actions 환경 감지 (YESFILE_HEADLESS=1이면 로컬에서도 headless)
     is_github_actions = os.environ.get('GITHUB_ACTIONS') == 'true'
     
-    if is_github_actions:
+    if profile == "lean":
+        logger.info("lean 브라우저 프로필 - headless(new), 작은 창, 부가 기능 비활성화")
+        for argument in LEAN_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+        profile_dir = _make_profile_dir()
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+    elif is_github_actions:
         logger.info("GitHub Actions 환경 감지됨 - headless 모드 활성화")
         chrome_options.add_argument("--headless")
+    elif os.environ.get('YESFILE_HEADLESS', '').lower() in ('1', 'true', 'yes'):
+        logger.info("YESFILE_HEADLESS 설정됨 - headless 모드 활성화")
+        chrome_options.add_argument("--headless")
     else:
         logger.info("로컬 환경 감지됨 - 브라우저 표시 모드")
         
@@ -44,8 +490,9 @@ def setup_driver():
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--disable-web-security")
     chrome_options.add_argument("--allow-running-insecure-content")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--start-maximized")
+    if profile != "lean":
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--start-maximized")
     
     # 봇 탐지 우회 설정 강화
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
@@ -56,99 +503,474 @@ def setup_driver():
     # 추가 안정성 옵션 (JavaScript는 활성화 상태 유지)
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--disable-plugins")
-    chrome_options.add_argument("--disable-images")  # 속도 향상
     # --disable-javascript 옵션 제거됨 (이것이 핵심!)
+
+    # 알림창을 자동으로 닫지 않음 - 로그인 실패 문구를 classify_page_state에서 읽기 위함
+    chrome_options.set_capability("unhandledPromptBehavior", "ignore")
+
+    # 이미지/미디어/폰트/광고 차단 (--disable-images는 최신 크롬에서 무시됨)
+    if get_block_profile() != "off":
+        chrome_options.add_experimental_option("prefs", BLOCKING_CHROME_PREFS)
     
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # 봇 탐지 우회 JavaScript 실행
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        # 타임아웃 설정
-        driver.implicitly_wait(20)  # 더 긴 대기 시간
-        driver.set_page_load_timeout(40)
-        
-        logger.info("크롬 드라이버 설정 완료 (JavaScript 활성화)")
-        return driver
+        with span("driver_startup", profile=profile) as record:
+            started = time.time()
+            driver_path = resolve_chromedriver()
+            resolved = time.time()
+            record["resolve_seconds"] = round(resolved - started, 3)
+
+            service = Service(driver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            # 봇 탐지 우회 JavaScript 실행
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            
+            # 타임아웃 및 요청 차단 설정
+            apply_driver_timeouts(driver)
+            apply_network_profile(driver)
+
+            # 드라이버 시작 시간과 메모리 기록 (로그인/출석 시간과 별도로 추적, 프로필별 비교용)
+            driver.yesfile_profile_dir = profile_dir
+            driver.yesfile_startup_seconds = time.time() - started
+            record_driver_startup(resolved - started, driver.yesfile_startup_seconds)
+            rss_mb = get_browser_rss_mb(driver)
+            if rss_mb is not None:
+                record["rss_mb"] = round(rss_mb, 1)
+
+            rss = f", RSS {rss_mb:.0f}MB" if rss_mb is not None else ""
+            logger.info(
+                f"크롬 드라이버 설정 완료 (JavaScript 활성화, 프로필 {profile}, "
+                f"시작 {driver.yesfile_startup_seconds:.2f}초{rss})"
+            )
+            return driver
         
     except Exception as e:
         logger.error(f"크롬 드라이버 설정 실패: {str(e)}")
         logger.error(f"상세 오류: {traceback.format_exc()}")
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
         return None
 
-def safe_find_element(driver, by, value, timeout=20):
-    """안전한 요소 찾기 (더 긴 대기 시간)"""
+# === 대기 시간 예산 ===
+
+# 단계별 최대 대기 시간(초) (YESFILE_TIMEOUTS="find_field=8,find_button=3" 형식으로 변경)
+STEP_TIMEOUTS = {
+    "page_load": PAGE_LOAD_TIMEOUT,  # driver.get 자체 (set_page_load_timeout)
+    "page_ready": 20,                # 로드 후 DOM/네트워크 유휴 대기
+    "event_page": 15,
+    "session_probe": 15,
+    "find_field": 15,                # 아이디/비밀번호 입력 필드
+    "find_button": 5,                # 로그인/출석 버튼
+    "navigation": 5,                 # 로그인 제출 후 이동
+    "js_login": 3,                   # JavaScript 로그인 함수 하나
+    "input_clear": 2,
+    "element_stable": 3,
+    "after_click": 5,                # 출석 버튼 클릭 후 요청 종료
+}
+DEFAULT_RUN_BUDGET = 240  # 계정 하나의 모든 대기 합계 상한(초), YESFILE_RUN_BUDGET으로 변경
+
+_budget_local = threading.local()
+_step_timeouts = None
+
+class BudgetExhausted(TimeoutException):
+    """계정 실행 시간 예산을 다 써서 더 기다릴 수 없음 (기존 TimeoutException 처리 흐름을 그대로 탐)"""
+
+class TimeoutBudget:
+    """계정 하나의 실행 시간 예산 (모든 대기가 남은 시간 안에서만 기다림)"""
+
+    def __init__(self, total):
+        self.total = total
+        self.deadline = time.monotonic() + total
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+def get_step_timeouts():
+    """기본 단계별 대기 시간에 YESFILE_TIMEOUTS 설정을 덮어쓴 값"""
+    global _step_timeouts
+    if _step_timeouts is None:
+        timeouts = dict(STEP_TIMEOUTS)
+        for item in _env_list('YESFILE_TIMEOUTS'):
+            name, _, value = item.partition("=")
+            try:
+                timeouts[name.strip()] = float(value)
+            except ValueError:
+                logger.warning(f"잘못된 YESFILE_TIMEOUTS 항목 무시: {item}")
+        _step_timeouts = timeouts
+    return _step_timeouts
+
+def step_timeout(step):
+    """단계의 최대 대기 시간(초)"""
+    return get_step_timeouts()[step]
+
+def get_run_budget():
+    """계정 하나의 대기 시간 예산(초) (YESFILE_RUN_BUDGET)"""
     try:
-        logger.debug(f"요소 찾기 시도: {by}='{value}'")
-        
-        # 요소가 존재하고 상호작용 가능할 때까지 대기
-        element = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable((by, value))
-        )
-        
-        # JavaScript 실행 완료 대기
-        time.sleep(2)
-        
-        # 요소가 화면에 보이도록 스크롤
-        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(1)
-        
-        logger.debug(f"요소 찾기 성공: {by}='{value}'")
-        return element
-        
+        return float(os.environ.get('YESFILE_RUN_BUDGET', DEFAULT_RUN_BUDGET))
+    except ValueError:
+        return float(DEFAULT_RUN_BUDGET)
+
+@contextmanager
+def run_budget(total=None):
+    """이 스레드에서 처리하는 계정의 예산 시작 (yield된 예산의 남은 시간을 호출 측에서 기록)"""
+    previous = getattr(_budget_local, "budget", None)
+    budget = _budget_local.budget = TimeoutBudget(get_run_budget() if total is None else total)
+    try:
+        yield budget
+    finally:
+        _budget_local.budget = previous
+
+def budget_timeout(requested=None, cap=True):
+    """요청한 대기 시간을 최대 대기 시간(cap=True일 때)과 남은 예산으로 줄인 값"""
+    timeout = get_max_wait() if requested is None else requested
+    if cap:
+        timeout = min(timeout, get_max_wait())
+    budget = getattr(_budget_local, "budget", None)
+    if budget is not None:
+        timeout = min(timeout, budget.remaining())
+    return max(0.0, timeout)
+
+def apply_page_load_budget(driver):
+    """남은 예산에 맞춰 페이지 로드 제한 시간 설정 (바뀔 때만 WebDriver 호출)"""
+    timeout = budget_timeout(step_timeout("page_load"), cap=False)
+    if timeout <= 0:
+        raise BudgetExhausted("계정 실행 시간 예산 소진")
+    timeout = max(1, int(timeout))
+    if getattr(driver, "yesfile_page_load_timeout", None) != timeout:
+        driver.set_page_load_timeout(timeout)
+        driver.yesfile_page_load_timeout = timeout
+
+# === 조건 기반 대기 ===
+
+# 네트워크 요청(XHR/fetch) 추적 스크립트를 주입하고 유휴 상태 여부를 반환
+NETWORK_IDLE_SCRIPT = """
+var idleMs = arguments[0];
+if (!window.__yfNet) {
+    var state = window.__yfNet = {pending: 0, last: performance.now()};
+    var done = function () { state.pending = Math.max(0, state.pending - 1); state.last = performance.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++; state.last = performance.now();
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.pending++; state.last = performance.now();
+            return originalFetch.apply(this, arguments).finally(done);
+        };
+    }
+}
+var last = window.__yfNet.last;
+var entries = performance.getEntriesByType('resource');
+for (var i = 0; i < entries.length; i++) { last = Math.max(last, entries[i].responseEnd); }
+return document.readyState === 'complete'
+    && window.__yfNet.pending === 0
+    && performance.now() - last >= idleMs;
+"""
+
+def get_max_wait():
+    """모든 대기의 최대 시간(초) (YESFILE_MAX_WAIT, 기본 20초)"""
+    try:
+        return float(os.environ.get('YESFILE_MAX_WAIT', 20))
+    except ValueError:
+        return 20.0
+
+def wait_until(driver, condition, timeout=None, poll=0.1):
+    """조건이 참이 될 때까지 대기 (최대 대기 시간과 남은 예산 적용, 성공 여부 반환)"""
+    timeout = budget_timeout(timeout)
+    if timeout <= 0:
+        return False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+        return True
+    except UnexpectedAlertPresentException as e:
+        # 알림창도 페이지의 반응이므로 대기를 끝냄 (문구는 classify_page_state가 읽음)
+        _note_alert(driver, e)
+        return True
     except TimeoutException:
-        logger.debug(f"요소 찾기 실패 (타임아웃): {by}='{value}'")
-        return None
+        return False
+
+def _note_alert(driver, error):
+    """대기 중 알림창이 떴음을 기록 (드라이버가 이미 닫았으면 문구만 남음)"""
+    if error.alert_text:
+        driver.yesfile_alert_text = error.alert_text
+    driver.yesfile_alert_pending = True
+
+def close_pending_alert(driver):
+    """대기 중 뜬 알림창을 닫고 문구는 남겨 둠 (열린 채로 두면 이후 명령이 모두 실패)"""
+    if not getattr(driver, "yesfile_alert_pending", False):
+        return
+    driver.yesfile_alert_pending = False
+    try:
+        alert = driver.switch_to.alert
+        text = alert.text
+        alert.accept()
+    except NoAlertPresentException:
+        return
+    if text:
+        driver.yesfile_alert_text = text
+
+def wait_for_dom_ready(driver, timeout=None):
+    """document.readyState가 complete가 될 때까지 대기"""
+    return wait_until(
+        driver, lambda d: d.execute_script("return document.readyState") == "complete", timeout
+    )
+
+def wait_for_network_idle(driver, timeout=None, idle_ms=500):
+    """DOM 로드 후 idle_ms 동안 진행 중인 요청과 새 리소스가 없을 때까지 대기"""
+    return wait_until(driver, lambda d: d.execute_script(NETWORK_IDLE_SCRIPT, idle_ms), timeout)
+
+def mark_network_activity(driver):
+    """클릭 직후 바로 유휴로 판단하지 않도록 마지막 활동 시각 갱신"""
+    try:
+        driver.execute_script(
+            "if (window.__yfNet) { window.__yfNet.last = performance.now(); }"
+        )
+    except Exception:
+        pass
+
+def wait_for_element_stable(driver, element, timeout=None):
+    """요소 위치/크기가 연속 두 번 같아질 때까지 대기 (애니메이션, 레이아웃 이동 종료)"""
+    last_rect = {}
+
+    def is_stable(d):
+        rect = d.execute_script(
+            "var r = arguments[0].getBoundingClientRect();"
+            "return [r.x, r.y, r.width, r.height];", element
+        )
+        stable = rect == last_rect.get("rect") and rect[2] > 0 and rect[3] > 0
+        last_rect["rect"] = rect
+        return stable
+
+    return wait_until(driver, is_stable, timeout)
+
+def wait_for_input_value(driver, element, value, timeout=None):
+    """입력 필드 값이 기대값이 될 때까지 대기"""
+    return wait_until(driver, lambda d: element.get_attribute("value") == value, timeout)
+
+def _cookie_snapshot(driver):
+    """쿠키 변경 감지용 (이름, 값) 집합"""
+    return {(c.get("name"), c.get("value")) for c in driver.get_cookies()}
+
+def wait_for_navigation(driver, old_url, old_cookies, timeout=None):
+    """URL 또는 쿠키가 바뀌거나 알림창이 뜰 때까지 대기한 뒤 페이지 안정화 대기"""
+    driver.yesfile_alert_text = ""
+
+    def changed(d):
+        try:
+            return d.current_url != old_url or _cookie_snapshot(d) != old_cookies
+        except UnexpectedAlertPresentException as e:
+            # 드라이버가 알림창을 이미 닫았을 수 있으므로 문구를 남겨 둠
+            _note_alert(d, e)
+            return True
+
+    if not wait_until(driver, changed, timeout):
+        return False
+
+    wait_for_network_idle(driver, timeout)
+    return True
+
+def navigate(driver, url, label, timeout=None, wait_idle=True):
+    """페이지 이동 후 로드 완료 대기 및 전송량/시간 기록"""
+    with span(f"page_load:{label}", url=url) as record:
+        apply_page_load_budget(driver)
+        close_pending_alert(driver)
+        driver.get(url)
+        if timeout is None:
+            timeout = step_timeout("page_ready")
+        ready = wait_for_dom_ready(driver, timeout)
+        if ready and wait_idle:
+            ready = wait_for_network_idle(driver, timeout)
+        close_pending_alert(driver)
+        if not ready:
+            record["outcome"] = "timeout"
+
+        metrics = report_page_metrics(driver, label)
+        if metrics:
+            record.update(metrics)
+        return ready
+
+# 여러 선택자를 한 번에 검사하여 처음으로 클릭 가능한 [선택자 순번, 요소] 반환
+MULTI_LOCATOR_SCRIPT = """
+var locators = arguments[0];
+function clickable(el) {
+    if (el.disabled) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.display === 'none') { return false; }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+function query(by, value) {
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var j = 0; j < snapshot.snapshotLength; j++) { nodes.push(snapshot.snapshotItem(j)); }
+        return nodes;
+    }
+    var css = value;
+    if (by === 'id') { css = '[id="' + CSS.escape(value) + '"]'; }
+    else if (by === 'name') { css = '[name="' + CSS.escape(value) + '"]'; }
+    else if (by === 'class name') { css = '.' + CSS.escape(value); }
+    return document.querySelectorAll(css);
+}
+for (var i = 0; i < locators.length; i++) {
+    var nodes;
+    try { nodes = query(locators[i][0], locators[i][1]); } catch (e) { continue; }
+    for (var k = 0; k < nodes.length; k++) {
+        if (clickable(nodes[k])) { return [i, nodes[k]]; }
+    }
+}
+return null;
+"""
+
+def find_first_clickable(driver, locators, timeout=15, step="find"):
+    """모든 선택자를 하나의 대기 시간 안에서 동시에 확인 (요소, 찾은 선택자) 반환"""
+    locators = list(locators)
+    script_args = [[by, value] for by, value in locators]
+    with span(f"find:{step}", candidates=len(locators)) as record:
+        # 첫 확인은 대기 시간과 상관없이 바로 하고, 이후는 예산 안에서만 다시 확인
+        found = driver.execute_script(MULTI_LOCATOR_SCRIPT, script_args)
+        try:
+            if found:
+                index, element = found
+            else:
+                index, element = WebDriverWait(driver, budget_timeout(timeout), poll_frequency=0.2).until(
+                    lambda d: d.execute_script(MULTI_LOCATOR_SCRIPT, script_args)
+                )
+        except TimeoutException:
+            logger.debug(f"요소 찾기 실패 (타임아웃): 선택자 {len(locators)}개")
+            record["outcome"] = "miss"
+            return None, None
+        record["outcome"] = "hit"
+        record["selector"] = selector_key(*locators[index])
+
+    # 요소가 화면에 보이도록 스크롤한 뒤 위치가 안정될 때까지 대기
+    driver.execute_script("arguments[0].scrollIntoView(true);", element)
+    wait_for_element_stable(driver, element, timeout=step_timeout("element_stable"))
+
+    logger.debug(f"요소 찾기 성공: {locators[index][0]}='{locators[index][1]}'")
+    return element, locators[index]
+
+# === 디버깅 정보 수집 ===
+
+# 페이지 상태를 한 번의 스크립트 호출로 수집 (요소별 WebDriver 호출 대신)
+PAGE_STATE_SCRIPT = """
+var buttons = document.getElementsByTagName('button');
+var details = [];
+for (var i = 0; i < Math.min(buttons.length, 5); i++) {
+    var b = buttons[i];
+    details.push({
+        text: (b.innerText || '').trim().slice(0, 80),
+        type: b.getAttribute('type'),
+        id: b.id,
+        'class': b.className,
+        onclick: b.getAttribute('onclick')
+    });
+}
+return {
+    url: location.href,
+    title: document.title,
+    ready_state: document.readyState,
+    js_enabled: typeof jQuery !== 'undefined' || document.readyState === 'complete',
+    buttons: buttons.length,
+    inputs: document.getElementsByTagName('input').length,
+    forms: document.getElementsByTagName('form').length,
+    button_details: details
+};
+"""
+
+_debug_local = threading.local()
+
+def get_debug_capture_mode():
+    """디버깅 정보 저장 방식 (YESFILE_DEBUG_CAPTURE: off / failure / sample, 기본 failure)"""
+    mode = os.environ.get('YESFILE_DEBUG_CAPTURE', 'failure').lower()
+    return mode if mode in ("off", "failure", "sample") else "failure"
+
+def _get_state_buffer():
+    """스레드별 최근 페이지 상태 링 버퍼 (YESFILE_DEBUG_RING_SIZE개, 기본 10)"""
+    buffer = getattr(_debug_local, "states", None)
+    if buffer is None:
+        try:
+            size = int(os.environ.get('YESFILE_DEBUG_RING_SIZE', 10))
+        except ValueError:
+            size = 10
+        buffer = _debug_local.states = deque(maxlen=max(1, size))
+    return buffer
+
+def reset_page_states():
+    """계정 처리 시작 시 링 버퍼 비우기 (다른 계정의 페이지 상태가 실패 기록에 섞이지 않도록)"""
+    _get_state_buffer().clear()
+
+def _debug_path_prefix(prefix):
+    """계정별로 파일이 겹치지 않도록 계정 이름을 붙인 파일명 접두어"""
+    account = getattr(_span_context, "account", None)
+    if not account:
+        return prefix
+    return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', account)}_{prefix}"
+
+def record_page_state(driver, label):
+    """현재 페이지 상태를 메모리 링 버퍼에 기록 (sample 모드에서는 일정 비율로 파일 저장)"""
+    mode = get_debug_capture_mode()
+    if mode == "off":
+        return
+
+    try:
+        state = driver.execute_script(PAGE_STATE_SCRIPT)
     except Exception as e:
-        logger.debug(f"요소 찾기 실패: {by}='{value}', 오류: {e}")
-        return None
+        logger.debug(f"페이지 상태 수집 실패 ({label}): {e}")
+        return
+
+    state.update({"label": label, "account": getattr(_span_context, "account", None), "time": time.time()})
+    _get_state_buffer().append(state)
+    logger.debug(
+        f"페이지 상태 [{label}] - 버튼: {state['buttons']}, Input: {state['inputs']}, Form: {state['forms']}"
+    )
+
+    if mode == "sample":
+        try:
+            sample_pct = float(os.environ.get('YESFILE_DEBUG_SAMPLE_PCT', 10))
+        except ValueError:
+            sample_pct = 10.0
+        if random.random() * 100 < sample_pct:
+            save_debug_info(driver, f"sample_{label}")
 
 def save_debug_info(driver, prefix="debug"):
-    """디버깅 정보 저장"""
+    """디버깅 정보 저장 (실패 시 호출: 스크린샷, HTML, 최근 페이지 상태)"""
+    if get_debug_capture_mode() == "off":
+        return
+
     try:
+        prefix = _debug_path_prefix(prefix)
+
+        # 현재 상태를 링 버퍼에 남긴 뒤 최근 상태 전체를 저장
+        try:
+            state = driver.execute_script(PAGE_STATE_SCRIPT)
+            state.update({"label": prefix, "account": getattr(_span_context, "account", None), "time": time.time()})
+            _get_state_buffer().append(state)
+            logger.info(f"현재 URL: {state['url']}")
+            logger.info(f"JavaScript 실행 상태: {state['js_enabled']}")
+            logger.info(f"페이지 요소 개수 - 버튼: {state['buttons']}, Input: {state['inputs']}, Form: {state['forms']}")
+        except Exception as e:
+            logger.warning(f"요소 분석 실패: {e}")
+
+        states_path = f"{prefix}_recent_states.json"
+        with open(states_path, "w", encoding="utf-8") as f:
+            json.dump(list(_get_state_buffer()), f, ensure_ascii=False, indent=2)
+        logger.info(f"최근 페이지 상태 저장: {states_path}")
+
         # 스크린샷 저장
         screenshot_path = f"{prefix}_screenshot.png"
         driver.save_screenshot(screenshot_path)
         logger.info(f"스크린샷 저장: {screenshot_path}")
-        
+
         # HTML 소스 저장
         html_path = f"{prefix}_page_source.html"
         with open(html_path, "w", encoding="utf-8") as f:
             f.write(driver.page_source)
         logger.info(f"HTML 소스 저장: {html_path}")
-        
-        # 현재 URL 로깅
-        logger.info(f"현재 URL: {driver.current_url}")
-        
-        # JavaScript 로드 확인
-        try:
-            js_enabled = driver.execute_script("return typeof jQuery !== 'undefined' || document.readyState === 'complete';")
-            logger.info(f"JavaScript 실행 상태: {js_enabled}")
-        except:
-            logger.warning("JavaScript 실행 상태를 확인할 수 없습니다.")
-        
-        # 모든 버튼과 폼 요소 정보 수집
-        try:
-            buttons = driver.find_elements(By.TAG_NAME, "button")
-            inputs = driver.find_elements(By.TAG_NAME, "input")
-            forms = driver.find_elements(By.TAG_NAME, "form")
-            
-            logger.info(f"페이지 요소 개수 - 버튼: {len(buttons)}, Input: {len(inputs)}, Form: {len(forms)}")
-            
-            # 각 버튼의 세부 정보
-            for i, btn in enumerate(buttons[:5]):  # 처음 5개만
-                text = btn.text.strip()
-                onclick = btn.get_attribute('onclick')
-                btn_type = btn.get_attribute('type')
-                btn_id = btn.get_attribute('id')
-                btn_class = btn.get_attribute('class')
-                logger.debug(f"Button {i}: text='{text}', type='{btn_type}', id='{btn_id}', class='{btn_class}', onclick='{onclick}'")
-                
-        except Exception as e:
-            logger.warning(f"요소 분석 실패: {e}")
-            
+
     except Exception as e:
         logger.warning(f"디버깅 정보 저장 실패: {e}")
 
@@ -179,26 +1001,249 @@ def get_login_credentials():
         logger.info("\n입력이 취소되었습니다.")
         return None, None
 
+def load_accounts(path):
+    """계정 목록 파일 읽기 (한 줄에 '아이디,비밀번호[,세션유효시간]', '#'으로 시작하면 주석)"""
+    accounts = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+        for line_no, row in enumerate(csv.reader(lines), 1):
+            if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                logger.warning(f"계정 목록 {line_no}번째 항목 형식 오류 - 건너뜀")
+                continue
+            account = {
+                "username": row[0].strip(),
+                "password": row[1].strip(),
+            }
+
+            # 세 번째 값: 계정별 세션 캐시 유효 시간(초)
+            if len(row) >= 3 and row[2].strip():
+                try:
+                    account["session_ttl"] = int(row[2])
+                except ValueError:
+                    logger.warning(f"계정 목록 {line_no}번째 항목의 세션 유효 시간 형식 오류 - 기본값 사용")
+
+            accounts.append(account)
+
+        logger.info(f"계정 목록 로드 완료: {len(accounts)}개 ({path})")
+        return accounts
+
+    except OSError as e:
+        logger.error(f"계정 목록 파일을 읽을 수 없습니다: {e}")
+        return []
+
+# === 선택자/방법 성공 기록 ===
+
+SELECTOR_STATS_FILE = os.environ.get('YESFILE_SELECTOR_STATS', 'yesfile_selector_stats.json')
+_selector_stats = None
+_selector_stats_pending = {}  # 마지막 저장 이후 이 프로세스가 더한 기록 (저장 시 파일 내용에 합침)
+_selector_stats_lock = threading.Lock()
+
+def selector_key(by, value):
+    """선택자 기록용 키"""
+    return f"{by}={value}"
+
+def _candidate_key(candidate):
+    """후보(선택자 튜플 또는 이름)의 기록용 키"""
+    if isinstance(candidate, tuple):
+        return selector_key(*candidate)
+    return candidate
+
+def _read_selector_stats_file():
+    try:
+        with open(SELECTOR_STATS_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _get_selector_stats():
+    """선택자 기록 로드 (최초 1회)"""
+    global _selector_stats
+    if _selector_stats is None:
+        _selector_stats = _read_selector_stats_file()
+    return _selector_stats
+
+def _add_step_result(stats, step, key, wins, misses, last_win=None):
+    entry = stats.setdefault(step, {}).setdefault(key, {"wins": 0, "misses": 0})
+    entry["wins"] = entry.get("wins", 0) + wins
+    entry["misses"] = entry.get("misses", 0) + misses
+    if last_win:
+        entry["last_win"] = max(entry.get("last_win", 0), last_win)
+
+def order_by_stats(step, candidates):
+    """마지막 성공 후보를 맨 앞에, 나머지는 (성공 - 실패) 횟수 순으로 정렬"""
+    with _selector_stats_lock:
+        stats = dict(_get_selector_stats().get(step, {}))
+
+    if not stats:
+        return list(candidates)
+
+    last_winner = max(stats, key=lambda k: stats[k].get("last_win", 0))
+    if not stats[last_winner].get("last_win"):
+        last_winner = None
+
+    def priority(candidate):
+        key = _candidate_key(candidate)
+        entry = stats.get(key, {})
+        return (key != last_winner, -(entry.get("wins", 0) - entry.get("misses", 0)))
+
+    # sorted는 안정 정렬이므로 기록이 같으면 원래 순서 유지
+    return sorted(candidates, key=priority)
+
+def record_step_result(step, key, hit):
+    """단계별 후보의 성공/실패 기록"""
+    last_win = time.time() if hit else None
+    with _selector_stats_lock:
+        for stats in (_get_selector_stats(), _selector_stats_pending):
+            _add_step_result(stats, step, key, int(hit), int(not hit), last_win)
+
+def find_with_stats(driver, step, locators, timeout):
+    """기록된 우선순위로 모든 선택자를 동시에 확인하고 결과 기록"""
+    ordered = order_by_stats(step, locators)
+    element, found = find_first_clickable(driver, ordered, timeout, step=step.split(":")[0])
+
+    # 찾은 선택자보다 우선순위가 높았던 선택자는 없었던 것으로 기록
+    missed = ordered[:ordered.index(found)] if found else ordered
+    for selector_type, selector_value in missed:
+        record_step_result(step, selector_key(selector_type, selector_value), False)
+    if found:
+        record_step_result(step, selector_key(*found), True)
+
+    return element, found
+
+def save_selector_stats():
+    """선택자 기록을 파일에 저장 (다른 프로세스가 그사이 저장한 기록과 합침)"""
+    global _selector_stats
+    with _selector_stats_lock:
+        if not _selector_stats_pending:
+            return
+        try:
+            with file_lock(f"{SELECTOR_STATS_FILE}.lock"):
+                stats = _read_selector_stats_file()
+                for step, entries in _selector_stats_pending.items():
+                    for key, entry in entries.items():
+                        _add_step_result(stats, step, key, entry["wins"], entry["misses"], entry.get("last_win"))
+                tmp_path = f"{SELECTOR_STATS_FILE}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(stats, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, SELECTOR_STATS_FILE)
+            _selector_stats = stats
+            _selector_stats_pending.clear()
+        except (OSError, TimeoutError) as e:
+            logger.warning(f"선택자 기록 저장 실패: {e}")
+
+def _submit_with_enter(driver, password_field):
+    """방법 1: Enter 키로 폼 제출"""
+    logger.info("Enter 키로 로그인 시도")
+    before_url, before_cookies = driver.current_url, _cookie_snapshot(driver)
+    password_field.send_keys(Keys.RETURN)
+    wait_for_navigation(driver, before_url, before_cookies, timeout=step_timeout("navigation"))
+
+    # 로그인 결과 확인
+    if check_login_success(driver):
+        logger.info("Enter 키 로그인 성공")
+        return True
+    return False
+
+def _submit_form(driver, password_field):
+    """방법 2: 폼을 직접 찾아서 제출"""
+    logger.info("폼 직접 제출 시도")
+    forms = driver.find_elements(By.TAG_NAME, "form")  # 없으면 바로 빈 목록 (대기 없음)
+    if forms:
+        form_element = forms[0]
+        before_url, before_cookies = driver.current_url, _cookie_snapshot(driver)
+        driver.execute_script("arguments[0].submit();", form_element)
+        wait_for_navigation(driver, before_url, before_cookies, timeout=step_timeout("navigation"))
+
+        if check_login_success(driver):
+            logger.info("폼 직접 제출 로그인 성공")
+            return True
+    return False
+
+def _submit_with_js_function(driver, password_field):
+    """방법 3: JavaScript로 로그인 함수 직접 호출"""
+    logger.info("JavaScript 로그인 함수 호출 시도")
+    # 일반적인 로그인 함수명들 시도
+    js_functions = [
+        "submitForm()",
+        "loginSubmit()",
+        "doLogin()",
+        "userLogin()",
+        "memberLogin()",
+        "login()"
+    ]
+
+    for js_func in order_by_stats("login_js", js_functions):
+        try:
+            before_url, before_cookies = driver.current_url, _cookie_snapshot(driver)
+            driver.execute_script(js_func)
+            wait_for_navigation(driver, before_url, before_cookies, timeout=step_timeout("js_login"))
+            if check_login_success(driver):
+                logger.info(f"JavaScript 함수 {js_func} 로그인 성공")
+                record_step_result("login_js", js_func, True)
+                return True
+        except:
+            pass
+        record_step_result("login_js", js_func, False)
+    return False
+
+def _submit_with_button(driver, password_field):
+    """방법 4: 로그인 버튼 찾기 (기존 방식)"""
+    logger.info("로그인 버튼 찾기 시도")
+    login_selectors = [
+        (By.XPATH, "//button[contains(text(), '로그인')]"),
+        (By.XPATH, "//input[@value='로그인']"),
+        (By.XPATH, "//input[@type='submit']"),
+        (By.CSS_SELECTOR, "button[type='submit']"),
+        (By.CSS_SELECTOR, "input[type='submit']"),
+        (By.XPATH, "//button[contains(@onclick, 'login')]"),
+        (By.XPATH, "//input[contains(@onclick, 'login')]")
+    ]
+
+    login_button, found = find_with_stats(driver, "login_button", login_selectors, timeout=step_timeout("find_button"))
+    if not login_button:
+        return False
+
+    logger.info(f"로그인 버튼 찾음: {found[0]}='{found[1]}'")
+    before_url, before_cookies = driver.current_url, _cookie_snapshot(driver)
+    login_button.click()
+    wait_for_navigation(driver, before_url, before_cookies, timeout=step_timeout("navigation"))
+
+    if check_login_success(driver):
+        logger.info("로그인 버튼 클릭 성공")
+        return True
+    return False
+
+# 로그인 제출 방법 (기록된 성공/실패 횟수에 따라 시도 순서가 바뀜)
+LOGIN_SUBMIT_METHODS = {
+    "enter": _submit_with_enter,
+    "form_submit": _submit_form,
+    "js_function": _submit_with_js_function,
+    "login_button": _submit_with_button,
+}
+
+def find_input_field(driver, step, selectors, label):
+    """기록된 우선순위로 입력 필드 찾기 (모든 선택자 동시 확인)"""
+    field, found = find_with_stats(driver, step, selectors, timeout=step_timeout("find_field"))
+    if field:
+        logger.info(f"{label} 입력 필드 찾음: {found[0]}='{found[1]}'")
+    return field
+
 def login_yesfile(driver, username, password):
     """예스파일 로그인 (폼 제출 방식 개선)"""
     try:
         logger.info("예스파일 로그인 시작")
         
         # 로그인 페이지로 이동
-        login_url = "https://www.yesfile.com/login"
+        login_url = LOGIN_URL
         logger.info(f"로그인 페이지 접속: {login_url}")
-        driver.get(login_url)
-        
-        # 페이지 로딩 완료 대기 (JavaScript 실행 포함)
-        WebDriverWait(driver, 20).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        
-        # 추가 JavaScript 로딩 대기
-        time.sleep(7)
+
+        # 페이지 로딩 완료 및 JavaScript 요청 종료 대기
+        navigate(driver, login_url, "login")
         
         # 디버깅 정보 저장
-        save_debug_info(driver, "login_page_with_js")
+        record_page_state(driver, "login_page_with_js")
         
         # 아이디 입력 필드 찾기
         username_selectors = [
@@ -211,22 +1256,18 @@ def login_yesfile(driver, username, password):
             (By.XPATH, "//input[@type='text' and contains(@name, 'user')]")
         ]
 
-        username_field = None
-        for selector_type, selector_value in username_selectors:
-            username_field = safe_find_element(driver, selector_type, selector_value, timeout=15)
-            if username_field:
-                logger.info(f"아이디 입력 필드 찾음: {selector_type}='{selector_value}'")
-                break
+        username_field = find_input_field(driver, "username", username_selectors, "아이디")
 
         if not username_field:
             logger.error("아이디 입력 필드를 찾을 수 없습니다.")
+            mark_failure(ERROR_SELECTOR_MISS, FAILURE_LOGIN_FIELD)
             save_debug_info(driver, "username_field_not_found")
             return False
 
         # 아이디 입력
         try:
             username_field.clear()
-            time.sleep(1)
+            wait_for_input_value(driver, username_field, "", timeout=step_timeout("input_clear"))
             username_field.send_keys(username)
             logger.info("아이디 입력 완료")
         except Exception as e:
@@ -242,269 +1283,1878 @@ def login_yesfile(driver, username, password):
             (By.XPATH, "//input[@type='password']")
         ]
 
-        password_field = None
-        for selector_type, selector_value in password_selectors:
-            password_field = safe_find_element(driver, selector_type, selector_value, timeout=15)
-            if password_field:
-                logger.info(f"비밀번호 입력 필드 찾음: {selector_type}='{selector_value}'")
-                break
+        password_field = find_input_field(driver, "password", password_selectors, "비밀번호")
 
         if not password_field:
             logger.error("비밀번호 입력 필드를 찾을 수 없습니다.")
+            mark_failure(ERROR_SELECTOR_MISS, FAILURE_LOGIN_FIELD)
             save_debug_info(driver, "password_field_not_found")
             return False
 
         # 비밀번호 입력
         try:
             password_field.clear()
-            time.sleep(1)
+            wait_for_input_value(driver, password_field, "", timeout=step_timeout("input_clear"))
             password_field.send_keys(password)
             logger.info("비밀번호 입력 완료")
         except Exception as e:
             logger.error(f"비밀번호 입력 실패: {e}")
             return False
 
-        # === 새로운 로그인 제출 방식 (복수 시도) ===
-        login_success = False
-        
-        # 방법 1: Enter 키로 폼 제출
-        try:
-            logger.info("Enter 키로 로그인 시도")
-            password_field.send_keys(Keys.RETURN)
-            time.sleep(5)
-            
-            # 로그인 결과 확인
-            if check_login_success(driver):
-                logger.info("Enter 키 로그인 성공")
-                return True
-        except Exception as e:
-            logger.warning(f"Enter 키 로그인 실패: {e}")
-
-        # 방법 2: 폼을 직접 찾아서 제출
-        try:
-            logger.info("폼 직접 제출 시도")
-            form_element = driver.find_element(By.TAG_NAME, "form")
-            if form_element:
-                driver.execute_script("arguments[0].submit();", form_element)
-                time.sleep(5)
-                
-                if check_login_success(driver):
-                    logger.info("폼 직접 제출 로그인 성공")
-                    return True
-        except Exception as e:
-            logger.warning(f"폼 직접 제출 실패: {e}")
-
-        # 방법 3: JavaScript로 로그인 함수 직접 호출
-        try:
-            logger.info("JavaScript 로그인 함수 호출 시도")
-            # 일반적인 로그인 함수명들 시도
-            js_functions = [
-                "submitForm()",
-                "loginSubmit()",
-                "doLogin()",
-                "userLogin()",
-                "memberLogin()",
-                "login()"
-            ]
-            
-            for js_func in js_functions:
-                try:
-                    driver.execute_script(js_func)
-                    time.sleep(3)
-                    if check_login_success(driver):
-                        logger.info(f"JavaScript 함수 {js_func} 로그인 성공")
-                        return True
-                except:
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"JavaScript 로그인 함수 호출 실패: {e}")
-
-        # 방법 4: 로그인 버튼 찾기 (기존 방식)
-        try:
-            logger.info("로그인 버튼 찾기 시도")
-            login_selectors = [
-                (By.XPATH, "//button[contains(text(), '로그인')]"),
-                (By.XPATH, "//input[@value='로그인']"),
-                (By.XPATH, "//input[@type='submit']"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.CSS_SELECTOR, "input[type='submit']"),
-                (By.XPATH, "//button[contains(@onclick, 'login')]"),
-                (By.XPATH, "//input[contains(@onclick, 'login')]")
-            ]
-
-            for selector_type, selector_value in login_selectors:
-                login_button = safe_find_element(driver, selector_type, selector_value, timeout=5)
-                if login_button:
-                    logger.info(f"로그인 버튼 찾음: {selector_type}='{selector_value}'")
-                    login_button.click()
-                    time.sleep(5)
-                    
-                    if check_login_success(driver):
-                        logger.info("로그인 버튼 클릭 성공")
-                        return True
-                    break
-        except Exception as e:
-            logger.warning(f"로그인 버튼 방식 실패: {e}")
+        # === 로그인 제출 (지난번에 성공한 방법부터 시도) ===
+        for method_name in order_by_stats("submit", list(LOGIN_SUBMIT_METHODS)):
+            with span(f"login_submit:{method_name}") as record:
+                try:
+                    if LOGIN_SUBMIT_METHODS[method_name](driver, password_field):
+                        record_step_result("submit", method_name, True)
+                        return True
+                except Exception as e:
+                    logger.warning(f"로그인 방법 '{method_name}' 실패: {e}")
+                record["outcome"] = "fail"
+            record_step_result("submit", method_name, False)
 
         # 모든 방법 실패
         logger.error("모든 로그인 방법이 실패했습니다.")
+        mark_failure(ERROR_UNKNOWN)
         save_debug_info(driver, "all_login_methods_failed")
         return False
 
     except Exception as e:
         logger.error(f"로그인 중 오류 발생: {str(e)}")
+        if isinstance(e, TimeoutException):
+            mark_failure(ERROR_TIMEOUT, FAILURE_PAGE_LOAD)
+        else:
+            mark_failure(ERROR_UNKNOWN)
         logger.error(f"상세 오류: {traceback.format_exc()}")
         save_debug_info(driver, "login_error")
         return False
 
+# === 페이지 상태 판별 ===
+
+# 판별 결과
+PAGE_LOGGED_IN = "logged_in"
+PAGE_LOGIN_ERROR = "login_error"
+PAGE_ATTENDANCE_DONE = "attendance_done"
+PAGE_ALREADY_ATTENDED = "already_attended"
+PAGE_UNKNOWN = "unknown"
+
+# 로그아웃 링크, 포인트 표시, 로그인 폼, 알림/메시지 영역 텍스트만 모아 반환 (page_source 전송 없음)
+PAGE_CLASSIFIER_SCRIPT = """
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) { return false; }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+var logout = !!document.querySelector(
+    'a[href*="logout" i], a[onclick*="logout" i], button[onclick*="logout" i], form[action*="logout" i]'
+);
+if (!logout) {
+    var links = document.querySelectorAll('a, button');
+    for (var i = 0; i < links.length && !logout; i++) {
+        logout = (links[i].textContent || '').trim() === '로그아웃';
+    }
+}
+var point = false;
+var pointNodes = document.querySelectorAll('[id*="point" i], [class*="point" i]');
+for (var j = 0; j < pointNodes.length && !point; j++) {
+    point = visible(pointNodes[j]) && /\\d/.test(pointNodes[j].textContent || '');
+}
+var passwordField = false;
+var passwords = document.querySelectorAll('input[type="password"]');
+for (var k = 0; k < passwords.length && !passwordField; k++) { passwordField = visible(passwords[k]); }
+var messages = [];
+var messageNodes = document.querySelectorAll(
+    '[role="alert"], [role="dialog"], .alert, .modal, .layer, .popup, [class*="msg"], [class*="message"], [id*="attend"], [class*="attend"]'
+);
+for (var m = 0; m < messageNodes.length && messages.length < 20; m++) {
+    if (visible(messageNodes[m])) { messages.push((messageNodes[m].innerText || '').trim().slice(0, 300)); }
+}
+return {url: location.href, logout: logout, point: point, password_field: passwordField, text: messages.join('\\n')};
+"""
+
+# 판별 문구 (우선순위 높은 순)
+PAGE_TEXT_GROUPS = [
+    (PAGE_ALREADY_ATTENDED, ALREADY_ATTENDED_MESSAGES),
+    (PAGE_ATTENDANCE_DONE, ATTENDANCE_SUCCESS_MESSAGES),
+    (PAGE_LOGIN_ERROR, LOGIN_ERROR_INDICATORS),
+    (PAGE_LOGGED_IN, LOGOUT_INDICATORS),
+]
+PAGE_TEXT_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{verdict}>{'|'.join(re.escape(word) for word in words)})"
+        for verdict, words in PAGE_TEXT_GROUPS
+    ),
+    re.IGNORECASE,
+)
+
+def match_page_text(text):
+    """한 번의 정규식 탐색으로 텍스트의 판별 결과와 일치 문구 반환 (없으면 PAGE_UNKNOWN)"""
+    found = {}
+    for match in PAGE_TEXT_PATTERN.finditer(text or ""):
+        found.setdefault(match.lastgroup, match.group(0))
+
+    for verdict, _ in PAGE_TEXT_GROUPS:
+        if verdict in found:
+            return verdict, found[verdict]
+    return PAGE_UNKNOWN, None
+
+def _pop_alert_text(driver):
+    """열린 알림창이 있으면 문구를 읽고 닫음 (이미 닫혔으면 대기 중 남겨 둔 문구)"""
+    captured = getattr(driver, "yesfile_alert_text", "")
+    driver.yesfile_alert_text = ""
+    driver.yesfile_alert_pending = False
+    try:
+        alert = driver.switch_to.alert
+        text = alert.text
+        alert.accept()
+        return text
+    except NoAlertPresentException:
+        return captured
+
+def classify_page_state(driver):
+    """브라우저 안에서 한 번의 스크립트로 페이지 상태 판별 (판별 결과, 신호 dict)"""
+    alert_text = _pop_alert_text(driver)
+    signals = driver.execute_script(PAGE_CLASSIFIER_SCRIPT)
+    signals["alert"] = alert_text
+
+    verdict, matched = match_page_text(f"{alert_text}\n{signals['text']}")
+    signals["matched"] = matched
+
+    if verdict in (PAGE_UNKNOWN, PAGE_LOGGED_IN) and (signals["logout"] or signals["point"]):
+        verdict = PAGE_LOGGED_IN
+    return verdict, signals
+
 def check_login_success(driver):
     """로그인 성공 여부 확인"""
     try:
-        current_url = driver.current_url.lower()
-        page_source = driver.page_source.lower()
+        verdict, signals = classify_page_state(driver)
 
-        # 로그인 성공 지표들
-        success_indicators = [
-            "마이페이지", "로그아웃", "내정보", "포인트", "구매자료",
-            "mypage", "logout", "point", "profile", "dashboard"
-        ]
+        if verdict == PAGE_LOGIN_ERROR:
+            logger.warning(f"로그인 실패 지표 발견: '{signals['matched']}'")
+            mark_failure(ERROR_AUTH)
+            return False
 
-        # URL 변경 확인
-        if "login" not in current_url:
-            logger.info("로그인 페이지에서 벗어남 - 성공 가능성")
-            
-        # 페이지 내용 확인
-        for indicator in success_indicators:
-            if indicator.lower() in page_source:
-                logger.info(f"로그인 성공 지표 발견: '{indicator}'")
-                return True
-        
-        # 실패 지표 확인
-        error_indicators = [
-            "로그인 실패", "아이디를 확인", "비밀번호를 확인", "login failed"
-        ]
-        
-        for error in error_indicators:
-            if error.lower() in page_source:
-                logger.warning(f"로그인 실패 지표 발견: '{error}'")
-                return False
+        if verdict != PAGE_UNKNOWN:
+            evidence = signals["matched"] or ("로그아웃 링크" if signals["logout"] else "포인트 표시")
+            logger.info(f"로그인 성공 지표 발견: '{evidence}'")
+            return True
 
-        # 명확하지 않은 경우
-        if "login" not in current_url:
+        # 명확하지 않은 경우: 로그인 페이지를 벗어났고 비밀번호 입력란이 없으면 성공으로 판단
+        if "login" not in signals["url"].lower() and not signals["password_field"]:
             logger.info("URL 변경 기준으로 로그인 성공으로 판단")
             return True
-            
+
         return False
-        
+
     except Exception as e:
         logger.warning(f"로그인 성공 여부 확인 실패: {e}")
         return False
 
-def check_attendance(driver):
-    """출석체크 수행"""
+def session_probe_logged_in(driver):
+    """세션 확인 페이지에 로그아웃 링크/포인트 같은 로그인 표시가 있는지 (404, 로그인 안내 화면은 실패)"""
+    try:
+        verdict, signals = classify_page_state(driver)
+    except Exception as e:
+        logger.warning(f"세션 상태 확인 실패: {e}")
+        return False
+    return verdict == PAGE_LOGGED_IN
+
+def get_session_ttl(account_ttl=None):
+    """세션 캐시 유효 시간 (계정별 설정 > YESFILE_SESSION_TTL > 기본값)"""
+    if account_ttl is not None:
+        return account_ttl
+    try:
+        return int(os.environ.get('YESFILE_SESSION_TTL', DEFAULT_SESSION_TTL))
+    except ValueError:
+        return DEFAULT_SESSION_TTL
+
+def _load_session_cache():
+    """세션 캐시 파일 읽기 (만료된 항목 제거)"""
+    try:
+        with open(SESSION_CACHE_FILE, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    now = time.time()
+    return {user: entry for user, entry in cache.items() if entry.get("expires_at", 0) > now}
+
+@contextmanager
+def _session_cache_guard():
+    """세션 캐시 읽기-수정-쓰기를 스레드와 프로세스(샤드) 모두에서 한 번에 하나씩"""
+    with _session_cache_lock, file_lock(f"{SESSION_CACHE_FILE}.lock", timeout=30):
+        yield
+
+def _write_session_cache(cache):
+    """세션 캐시 파일 저장 (임시 파일에 쓴 뒤 교체, _session_cache_guard 안에서 호출)"""
+    tmp_path = f"{SESSION_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    try:
+        os.chmod(tmp_path, 0o600)  # 로그인 쿠키가 들어 있으므로 본인만 읽기
+    except OSError:
+        pass
+    os.replace(tmp_path, SESSION_CACHE_FILE)
+
+def save_session(driver, username, ttl):
+    """로그인 성공 후 쿠키를 계정별로 캐시에 저장"""
+    if ttl <= 0:
+        return
+    try:
+        now = time.time()
+        with _session_cache_guard():
+            cache = _load_session_cache()
+            cache[username] = {
+                "cookies": driver.get_cookies(),
+                "saved_at": now,
+                "expires_at": now + ttl,
+            }
+            _write_session_cache(cache)
+        logger.info(f"[{username}] 로그인 세션 저장 (유효 시간 {ttl}초)")
+    except Exception as e:
+        logger.warning(f"[{username}] 로그인 세션 저장 실패: {e}")
+
+def drop_session(username):
+    """캐시된 세션 삭제"""
+    try:
+        with _session_cache_guard():
+            cache = _load_session_cache()
+            if cache.pop(username, None) is not None:
+                _write_session_cache(cache)
+    except Exception as e:
+        logger.debug(f"[{username}] 세션 캐시 삭제 실패: {e}")
+
+def restore_session(driver, username):
+    """캐시된 쿠키를 드라이버에 복원하고 가벼운 페이지로 로그인 상태 확인"""
+    with _session_cache_lock:
+        entry = _load_session_cache().get(username)
+    if not entry:
+        return False
+
+    try:
+        # 쿠키는 같은 도메인 페이지에 있어야 추가할 수 있음
+        driver.get(f"{BASE_URL}/robots.txt")
+        for cookie in entry["cookies"]:
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"쿠키 복원 실패 ({cookie.get('name')}): {e}")
+
+        navigate(driver, SESSION_PROBE_URL, "session_probe", timeout=step_timeout("session_probe"), wait_idle=False)
+
+        # URL만으로는 판단하지 않고 로그인 표시가 보일 때만 세션을 재사용
+        if session_probe_logged_in(driver):
+            logger.info(f"[{username}] 캐시된 세션으로 로그인 확인 - 로그인 생략")
+            return True
+
+    except Exception as e:
+        logger.warning(f"[{username}] 캐시된 세션 확인 실패: {e}")
+
+    logger.info(f"[{username}] 캐시된 세션이 만료됨 - 다시 로그인")
+    drop_session(username)
+    driver.delete_all_cookies()
+    return False
+
+def ensure_logged_in(driver, username, password, session_ttl=None):
+    """캐시된 세션이 유효하면 재사용하고, 아니면 전체 로그인 수행"""
+    ttl = get_session_ttl(session_ttl)
+
+    if ttl > 0 and restore_session(driver, username):
+        return True
+
+    if not login_yesfile(driver, username, password):
+        return False
+
+    save_session(driver, username, ttl)
+    return True
+
+# 출석 버튼이 있을 수 있는 이벤트 페이지 URL들
+EVENT_URLS = [
+    f"{BASE_URL}/event/#tab=view&id=attendroulette",
+    f"{BASE_URL}/event/attendance",
+    f"{BASE_URL}/event",
+    f"{BASE_URL}/"
+]
+
+def check_attendance(driver, preferred_urls=None):
+    """출석체크 수행 (preferred_urls: 미리 확인한 출석 위젯 페이지, 먼저 시도)"""
     try:
         logger.info("출석체크 시작")
 
-        # 이벤트 페이지 URL들
-        event_urls = [
-            "https://www.yesfile.com/event/#tab=view&id=attendroulette",
-            "https://www.yesfile.com/event/attendance",
-            "https://www.yesfile.com/event",
-            "https://www.yesfile.com/"
-        ]
+        # 미리 확인한 페이지, 그다음 지난번에 출석 버튼이 있던 페이지부터 시도
+        event_urls = order_by_stats("attendance_url", EVENT_URLS)
+        if preferred_urls:
+            event_urls = [u for u in preferred_urls if u in event_urls] + [u for u in event_urls if u not in preferred_urls]
 
         for url in event_urls:
             try:
-                logger.info(f"이벤트 페이지 접속: {url}")
-                driver.get(url)
-                
-                # JavaScript 로딩 완료 대기
-                WebDriverWait(driver, 15).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                time.sleep(5)
-                
-                save_debug_info(driver, f"event_page_{event_urls.index(url)}")
-
-                # 출석체크 버튼 찾기
-                attendance_selectors = [
-                    (By.CSS_SELECTOR, "#attendroulette > button"),
-                    (By.CSS_SELECTOR, "button[class*='attend']"),
-                    (By.XPATH, "//button[contains(text(), '출석체크')]"),
-                    (By.XPATH, "//button[contains(text(), '출석')]"),
-                    (By.XPATH, "//a[contains(text(), '출석체크')]"),
-                    (By.XPATH, "//a[contains(text(), '출석')]"),
-                    (By.CSS_SELECTOR, "a[href*='attendance']"),
-                    (By.CSS_SELECTOR, "button[onclick*='attendance']")
-                ]
-
-                for selector_type, selector_value in attendance_selectors:
-                    attendance_element = safe_find_element(driver, selector_type, selector_value, timeout=5)
+                with span("attendance_url", url=url) as url_record:
+                    logger.info(f"이벤트 페이지 접속: {url}")
+
+                    # JavaScript 로딩 및 요청 종료 대기
+                    navigate(driver, url, "event", timeout=step_timeout("event_page"))
+                    
+                    record_page_state(driver, f"event_page_{EVENT_URLS.index(url)}")
+
+                    # 출석체크 버튼 찾기
+                    attendance_selectors = [
+                        (By.CSS_SELECTOR, "#attendroulette > button"),
+                        (By.CSS_SELECTOR, "button[class*='attend']"),
+                        (By.XPATH, "//button[contains(text(), '출석체크')]"),
+                        (By.XPATH, "//button[contains(text(), '출석')]"),
+                        (By.XPATH, "//a[contains(text(), '출석체크')]"),
+                        (By.XPATH, "//a[contains(text(), '출석')]"),
+                        (By.CSS_SELECTOR, "a[href*='attendance']"),
+                        (By.CSS_SELECTOR, "button[onclick*='attendance']")
+                    ]
+
+                    attendance_element, found = find_with_stats(
+                        driver, f"attendance:{url}", attendance_selectors, timeout=step_timeout("find_button")
+                    )
                     if attendance_element:
-                        logger.info(f"출석체크 버튼 찾음: {selector_type}='{selector_value}'")
+                        logger.info(f"출석체크 버튼 찾음: {found[0]}='{found[1]}'")
+                        record_step_result("attendance_url", url, True)
+                        url_record["outcome"] = "found"
+                        mark_network_activity(driver)
                         attendance_element.click()
-                        time.sleep(5)
+                        wait_for_network_idle(driver, timeout=step_timeout("after_click"))
 
                         # 출석체크 완료 확인
-                        page_source = driver.page_source.lower()
-                        success_messages = [
-                            "출석완료", "출석체크 완료", "이미 출석", "포인트가 적립",
-                            "attendance complete", "출석 성공"
-                        ]
-
-                        for message in success_messages:
-                            if message.lower() in page_source:
-                                logger.info(f"출석체크 완료: '{message}'")
-                                return True
+                        verdict, signals = classify_page_state(driver)
+                        if verdict in (PAGE_ATTENDANCE_DONE, PAGE_ALREADY_ATTENDED):
+                            logger.info(f"출석체크 완료: '{signals['matched']}' ({verdict})")
+                            return True
 
+                        # 완료 문구가 없으면 오늘 출석으로 확정하지 않음 (다음 실행에서 다시 확인)
                         logger.info("출석체크 버튼 클릭 완료 (결과 확인 중)")
+                        mark_unverified()
                         return True
 
+                    record_step_result("attendance_url", url, False)
+                    url_record["outcome"] = "miss"
+
             except Exception as e:
                 logger.debug(f"URL {url}에서 출석체크 실패: {e}")
+                if isinstance(e, TimeoutException):
+                    mark_failure(ERROR_TIMEOUT, FAILURE_PAGE_LOAD)
                 continue
 
         logger.warning("출석체크 버튼을 찾을 수 없습니다.")
+        mark_failure(ERROR_SELECTOR_MISS, FAILURE_ATTENDANCE_BUTTON)
+        save_debug_info(driver, "attendance_button_not_found")
         return False
 
     except Exception as e:
         logger.error(f"출석체크 중 오류: {str(e)}")
+        if isinstance(e, TimeoutException):
+            mark_failure(ERROR_TIMEOUT, FAILURE_PAGE_LOAD)
+        else:
+            mark_failure(ERROR_UNKNOWN)
         return False
 
-def main():
-    """메인 함수"""
-    driver = None
+# === HTTP 직접 출석 (Selenium 없이) ===
+
+# 출석(룰렛) 요청 주소 (YESFILE_HTTP_ATTEND_URL로 변경)
+HTTP_ATTEND_URL = os.environ.get('YESFILE_HTTP_ATTEND_URL', f"{BASE_URL}/event/attendroulette")
+HTTP_TIMEOUT = 15
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# JavaScript 챌린지/봇 차단 페이지 문구 (보이면 브라우저 방식으로 전환)
+HTTP_CHALLENGE_MARKERS = [
+    "cf-browser-verification", "challenge-platform", "cf_chl", "captcha",
+    "enable javascript", "javascript를 활성화", "자바스크립트를 활성화"
+]
+
+# HTTP 방식 결과
+HTTP_SUCCESS = "success"
+HTTP_LOGIN_ERROR = "login_error"
+HTTP_FALLBACK = "fallback"
+
+_http_local = threading.local()
+
+class _LoginFormParser(HTMLParser):
+    """로그인 페이지에서 비밀번호 입력이 있는 폼의 action과 입력값 수집"""
+
+    def __init__(self):
+        super().__init__()
+        self.forms = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._current = {
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "inputs": [],
+            }
+            self.forms.append(self._current)
+        elif tag == "input" and self._current is not None and attrs.get("name"):
+            self._current["inputs"].append({
+                "name": attrs["name"],
+                "type": (attrs.get("type") or "text").lower(),
+                "value": attrs.get("value") or "",
+            })
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._current = None
+
+class _VisibleTextParser(HTMLParser):
+    """script/style을 뺀 화면 텍스트와 로그아웃 링크/폼 유무 수집"""
+
+    HIDDEN_TAGS = ("script", "style", "noscript", "template")
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.logout = False
+        self._hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.HIDDEN_TAGS:
+            self._hidden_depth += 1
+            return
+        for name, value in attrs:
+            if name in ("href", "onclick", "action") and value and "logout" in value.lower():
+                self.logout = True
+
+    def handle_endtag(self, tag):
+        if tag in self.HIDDEN_TAGS and self._hidden_depth:
+            self._hidden_depth -= 1
+
+    def handle_data(self, data):
+        if not self._hidden_depth:
+            self.parts.append(data)
+
+def _read_page(html):
+    """(화면 텍스트, 로그아웃 링크 유무) - 페이지 JavaScript 안의 검증 문구는 판별에서 제외"""
+    parser = _VisibleTextParser()
+    parser.feed(html)
+    return "\n".join(parser.parts), parser.logout
+
+def http_mode_enabled():
+    """HTTP 직접 출석 사용 여부 (YESFILE_HTTP_MODE=1)"""
+    return os.environ.get('YESFILE_HTTP_MODE', '').lower() in ('1', 'true', 'yes')
+
+def get_http_session():
+    """스레드별 requests 세션 (연결 풀 재사용, 쿠키는 계정마다 초기화)"""
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = HTTP_USER_AGENT
+        _http_local.session = session
+    return session
+
+def _is_challenge(response):
+    """JavaScript 챌린지나 차단 응답인지 확인"""
+    if response.status_code in (403, 429, 503):
+        return True
+    text = response.text.lower()
+    return any(marker in text for marker in HTTP_CHALLENGE_MARKERS)
+
+def _build_login_payload(html, username, password):
+    """로그인 폼을 찾아 (action, method, 전송값) 반환 (폼이 없으면 None)"""
+    parser = _LoginFormParser()
+    parser.feed(html)
+
+    for form in parser.forms:
+        if not any(field["type"] == "password" for field in form["inputs"]):
+            continue
+
+        payload = {}
+        for field in form["inputs"]:
+            if field["type"] == "password":
+                payload[field["name"]] = password
+            elif field["type"] in ("text", "email") and field["name"] in ("userid", "username", "user_id", "id"):
+                payload[field["name"]] = username
+            elif field["type"] not in ("submit", "button", "checkbox", "radio"):
+                payload[field["name"]] = field["value"]
+        return urljoin(LOGIN_URL, form["action"] or LOGIN_URL), form["method"], payload
+
+    return None
+
+def try_http_attendance(username, password):
+    """requests로 로그인 및 출석 요청 (HTTP_SUCCESS / HTTP_LOGIN_ERROR / HTTP_FALLBACK)"""
+    session = get_http_session()
+    session.cookies.clear()
+
     try:
-        logger.info("=== 예스파일 자동 출석체크 시작 (JavaScript 활성화) ===")
-        logger.info(f"실행 환경: {'GitHub Actions' if os.environ.get('GITHUB_ACTIONS') else '로컬'}")
+        response = session.get(LOGIN_URL, timeout=HTTP_TIMEOUT)
+        if _is_challenge(response):
+            logger.info(f"[{username}] HTTP 로그인 페이지에서 챌린지 감지 - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
 
-        # 로그인 정보 가져오기
-        username, password = get_login_credentials()
-        if not username or not password:
-            logger.error("로그인 정보가 없습니다.")
-            return False
+        form = _build_login_payload(response.text, username, password)
+        if not form:
+            logger.info(f"[{username}] HTTP 응답에서 로그인 폼을 찾지 못함 - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
+
+        action, method, payload = form
+        if method == "post":
+            response = session.post(action, data=payload, timeout=HTTP_TIMEOUT, headers={"Referer": LOGIN_URL})
+        else:
+            response = session.get(action, params=payload, timeout=HTTP_TIMEOUT, headers={"Referer": LOGIN_URL})
+
+        if _is_challenge(response):
+            logger.info(f"[{username}] HTTP 로그인 응답에서 챌린지 감지 - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
+
+        # 로그아웃 링크가 있으면 성공, 실패 문구는 로그인 폼이 다시 보일 때만 실패로 확정
+        text, has_logout = _read_page(response.text)
+        verdict, matched = match_page_text(text)
+        if not has_logout and verdict == PAGE_LOGIN_ERROR:
+            if _build_login_payload(response.text, username, password):
+                logger.warning(f"[{username}] HTTP 로그인 실패 지표 발견: '{matched}'")
+                return HTTP_LOGIN_ERROR
+            logger.info(f"[{username}] HTTP 로그인 실패 문구가 있지만 폼이 없음 - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
+
+        if not has_logout and verdict in (PAGE_UNKNOWN, PAGE_LOGIN_ERROR):
+            logger.info(f"[{username}] HTTP 로그인 결과를 판단할 수 없음 - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
+
+        logger.info(f"[{username}] HTTP 로그인 성공")
+
+        response = session.post(HTTP_ATTEND_URL, timeout=HTTP_TIMEOUT, headers={"Referer": f"{BASE_URL}/event"})
+        if _is_challenge(response) or response.status_code != 200:
+            logger.info(f"[{username}] HTTP 출석 응답 이상 (HTTP {response.status_code}) - 브라우저 방식으로 전환")
+            return HTTP_FALLBACK
+
+        verdict, matched = match_page_text(_read_page(response.text)[0])
+        if verdict in (PAGE_ATTENDANCE_DONE, PAGE_ALREADY_ATTENDED):
+            logger.info(f"[{username}] HTTP 출석체크 완료: '{matched}' ({verdict})")
+            return HTTP_SUCCESS
+
+        logger.info(f"[{username}] HTTP 출석 결과를 판단할 수 없음 - 브라우저 방식으로 전환")
+        return HTTP_FALLBACK
+
+    except requests.RequestException as e:
+        logger.warning(f"[{username}] HTTP 요청 실패 - 브라우저 방식으로 전환: {e}")
+        return HTTP_FALLBACK
+
+def run_http_first(username, password):
+    """HTTP 방식이 켜져 있으면 먼저 시도 (결과 확정 시 True/False, 브라우저가 필요하면 None)"""
+    if not http_mode_enabled():
+        return None
+
+    with account_context(username), span("http_attendance") as record:
+        outcome = try_http_attendance(username, password)
+        record["outcome"] = outcome
+
+    if outcome == HTTP_SUCCESS:
+        return True
+    if outcome == HTTP_LOGIN_ERROR:
+        logger.error(f"[{username}] 로그인에 실패했습니다. (HTTP)")
+        mark_failure(ERROR_AUTH)
+        return False
+    return None
+
+# === 브라우저 시작 중 네트워크 예열 ===
+
+# 이벤트 페이지 HTML에 이 문자열이 있으면 출석 위젯이 있는 페이지로 봄
+# 예열은 로그인 전에 하므로, 위젯이 로그인 후에만 보이면 아무것도 찾지 못하고 기록된 순서를 그대로 씀
+PREFETCH_MARKER = "attendroulette"
+PREFETCH_TIMEOUT = 5
+
+_prefetch_lock = threading.Lock()
+_prefetch_thread = None
+_prefetched_event_urls = []
+
+def prefetch_enabled():
+    """네트워크 예열 사용 여부 (YESFILE_PREFETCH=0이면 끔)"""
+    return os.environ.get('YESFILE_PREFETCH', '1').lower() not in ('0', 'false', 'no')
+
+def prefetch_site():
+    """DNS 조회, TLS 연결, 로그인/이벤트 페이지 HTML 조회 후 출석 위젯이 있는 이벤트 URL 목록 반환"""
+    parts = urlsplit(BASE_URL)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+
+    with span("prefetch") as record:
+        started = time.perf_counter()
+        try:
+            socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+        except OSError as e:
+            logger.debug(f"DNS 조회 실패: {e}")
+            record["outcome"] = "dns_fail"
+            return []
+        record["dns_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        found = []
+        pages = {}
+        with requests.Session() as session:
+            session.headers["User-Agent"] = HTTP_USER_AGENT
+            try:
+                # 첫 요청이 TCP/TLS 연결을 맺고, 이후 요청은 같은 연결을 재사용
+                started = time.perf_counter()
+                session.get(LOGIN_URL, timeout=PREFETCH_TIMEOUT)
+                record["login_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+                for url in EVENT_URLS:
+                    page_url = url.split("#", 1)[0]
+                    if page_url not in pages:
+                        response = session.get(page_url, timeout=PREFETCH_TIMEOUT)
+                        pages[page_url] = response.status_code == 200 and PREFETCH_MARKER in response.text
+                    if pages[page_url]:
+                        found.append(url)
+            except requests.RequestException as e:
+                logger.debug(f"페이지 미리 받기 실패: {e}")
+                record["outcome"] = "fetch_fail"
+
+        record["found"] = len(found)
+        if found:
+            logger.info(f"출석 위젯이 있는 페이지 {len(found)}개 확인: {found[0]}")
+        return found
+
+def _prefetch_worker():
+    global _prefetched_event_urls
+    found = prefetch_site()
+    with _prefetch_lock:
+        _prefetched_event_urls = found
 
-        # 드라이버 설정
-        driver = setup_driver()
-        if not driver:
-            logger.error("드라이버 설정에 실패했습니다.")
+def start_prefetch():
+    """브라우저를 띄우는 동안 백그라운드에서 네트워크 예열 (프로세스당 한 번)"""
+    global _prefetch_thread
+    if not prefetch_enabled():
+        return
+    with _prefetch_lock:
+        if _prefetch_thread is None:
+            _prefetch_thread = threading.Thread(target=_prefetch_worker, name="prefetch", daemon=True)
+            _prefetch_thread.start()
+
+def get_preferred_event_urls(timeout=PREFETCH_TIMEOUT):
+    """예열에서 확인한 출석 위젯 페이지 (끝나지 않았으면 timeout까지만 기다림)"""
+    with _prefetch_lock:
+        thread = _prefetch_thread
+    if thread is None:
+        return []
+    thread.join(timeout)
+    with _prefetch_lock:
+        return list(_prefetched_event_urls)
+
+def run_account(driver, username, password, session_ttl=None):
+    """계정 하나에 대해 로그인 후 출석체크 수행 (모든 대기는 계정 예산 안에서)"""
+    with account_context(username), span("account") as record, run_budget() as budget:
+        record["budget"] = budget.total
+        with span("login") as login_record:
+            logged_in = ensure_logged_in(driver, username, password, session_ttl)
+            if not logged_in:
+                login_record["outcome"] = "fail"
+
+        if not logged_in:
+            logger.error(f"[{username}] 로그인에 실패했습니다.")
+            save_selector_stats()
+            record["outcome"] = "login_failed"
             return False
 
-        # 로그인
-        if login_yesfile(driver, username, password):
-            logger.info("로그인 성공!")
+        logger.info(f"[{username}] 로그인 성공!")
+
+        with span("attendance") as attendance_record:
+            attended = check_attendance(driver, get_preferred_event_urls())
+            if not attended:
+                attendance_record["outcome"] = "fail"
+        save_selector_stats()
+
+        # 캐시된 세션이 실제로는 로그인 상태가 아니었을 수 있으므로 다음 실행은 새로 로그인
+        if not attended or is_unverified():
+            drop_session(username)
+
+        if attended:
+            logger.info(f"[{username}] 출석체크 완료!")
+            return True
+
+        logger.warning(f"[{username}] 출석체크를 완료할 수 없었습니다.")
+        record["outcome"] = "attendance_failed"
+        return False
+
+def reset_browser_context(driver):
+    """다음 계정을 위해 새 탭으로 옮기고 쿠키/스토리지/타임아웃 초기화 (재실행 없이 세션 격리)"""
+    # 이전 계정에서 열린 알림창이 남아 있으면 이후 명령이 모두 실패하므로 먼저 닫음
+    try:
+        driver.switch_to.alert.accept()
+    except NoAlertPresentException:
+        pass
+    driver.yesfile_alert_text = ""
+    driver.yesfile_alert_pending = False
+
+    try:
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    except Exception as e:
+        logger.debug(f"스토리지 초기화 실패: {e}")
+
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": BASE_URL, "storageTypes": "all"})
+    except Exception:
+        driver.delete_all_cookies()
+
+    # 이전 계정의 탭(히스토리, 열린 팝업 포함)을 닫고 빈 탭 하나만 남김
+    old_handles = driver.window_handles
+    driver.switch_to.new_window("tab")
+    new_handle = driver.current_window_handle
+    for handle in old_handles:
+        try:
+            driver.switch_to.window(handle)
+            driver.close()
+        except Exception as e:
+            logger.debug(f"이전 탭 닫기 실패: {e}")
+    driver.switch_to.window(new_handle)
+
+    apply_driver_timeouts(driver)
+    apply_network_profile(driver)
+
+def get_browser_rss_mb(driver):
+    """chromedriver와 하위 크롬 프로세스의 RSS 합계(MB) (리눅스 외에는 None)"""
+    try:
+        root_pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return process_tree_rss_mb(root_pid)
+
+def process_tree_rss_mb(root_pid):
+    """프로세스와 모든 하위 프로세스의 RSS 합계(MB) (/proc이 없으면 None)"""
+    if not os.path.isdir("/proc"):
+        return None
+
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    total_kb = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+def get_recycle_limits():
+    """브라우저 재시작 기준 (YESFILE_RECYCLE_AFTER 계정 수, YESFILE_RECYCLE_RSS_MB 메모리)"""
+    try:
+        after = int(os.environ.get('YESFILE_RECYCLE_AFTER', 25))
+    except ValueError:
+        after = 25
+    try:
+        rss_mb = float(os.environ.get('YESFILE_RECYCLE_RSS_MB', 1500))
+    except ValueError:
+        rss_mb = 1500.0
+    return after, rss_mb
+
+def reuse_or_recycle_driver(driver, accounts_served):
+    """기존 브라우저를 초기화해 재사용하거나, 기준을 넘으면 재시작 (드라이버 반환, 실패 시 None)"""
+    recycle_after, recycle_rss_mb = get_recycle_limits()
+    rss_mb = get_browser_rss_mb(driver)
+
+    if accounts_served >= recycle_after or (rss_mb is not None and rss_mb >= recycle_rss_mb):
+        rss = f", RSS {rss_mb:.0f}MB" if rss_mb is not None else ""
+        logger.info(f"브라우저 재시작: 처리 계정 {accounts_served}개{rss}")
+        quit_driver(driver)
+        return None
+
+    started = time.time()
+    reset_browser_context(driver)
+    reset_seconds = time.time() - started
+
+    launch_seconds = getattr(driver, "yesfile_startup_seconds", None)
+    saved = f", 재실행 대비 {launch_seconds - reset_seconds:.2f}초 절약" if launch_seconds else ""
+    rss = f", RSS {rss_mb:.0f}MB" if rss_mb is not None else ""
+    logger.info(f"브라우저 재사용: 초기화 {reset_seconds:.2f}초{saved}{rss}")
+    return driver
+
+def quit_driver(driver):
+    """드라이버 종료 (오류 무시, lean 프로필의 임시 사용자 데이터 폴더도 삭제)"""
+    try:
+        driver.quit()
+        logger.info("브라우저를 종료했습니다.")
+    except Exception:
+        pass
+
+    profile_dir = getattr(driver, "yesfile_profile_dir", None)
+    if profile_dir:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+# === 사전 점검과 차단기 (사이트 장애 시 남은 계정 보류) ===
+
+# 차단기가 세는 실패 위치 (같은 위치에서 연속으로 실패하면 사이트 문제로 봄)
+BREAKER_FAILURE_KINDS = {FAILURE_PAGE_LOAD, FAILURE_LOGIN_FIELD, FAILURE_ATTENDANCE_BUTTON}
+BREAKER_PROBE_WAIT = 10  # 확인 계정이 실행 중일 때 보류 계정의 재시도 간격(초)
+PREFLIGHT_TIMEOUT = 10
+
+class CircuitBreaker:
+    """같은 종류의 실패가 연속 threshold번이면 열려서 남은 계정을 바로 보류하고,
+    cooldown초 후 한 계정만 실행해(half-open) 사이트 복구 여부 확인"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.clock = time.monotonic
+        self.state = self.CLOSED
+        self.last_kind = None
+        self.consecutive = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.probe_at = None
+        self.deferred = 0
+        self.transitions = []
+        self.preflight = None
+
+    def _guard(self):
+        """상태를 읽고 바꾸는 동안 잡는 잠금"""
+        return self.lock
+
+    def _transition(self, state, reason):
+        logger.warning(f"차단기 {self.state} -> {state}: {reason}")
+        self.transitions.append({
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "from": self.state, "to": state, "reason": reason,
+        })
+        self.state = state
+        self.probe_in_flight = False
+        if state == self.OPEN:
+            self.opened_at = self.clock()
+        else:
+            self.consecutive = 0
+            self.last_kind = None
 
-            # 출석체크
-            if check_attendance(driver):
-                logger.info("출석체크 완료!")
+    def allow(self):
+        """계정을 실행해도 되는지 (열려 있으면 False, half-open이면 한 계정만 True)"""
+        with self._guard():
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self._transition(self.HALF_OPEN, "대기 시간 경과 - 한 계정으로 복구 확인")
+            # 확인 계정이 계정 예산을 넘기도록 끝나지 않으면 (프로세스가 죽은 경우 등) 다른 계정이 확인
+            if self.state == self.HALF_OPEN and (
+                not self.probe_in_flight or self.clock() - self.probe_at > get_run_budget()
+            ):
+                self.probe_in_flight = True
+                self.probe_at = self.clock()
                 return True
+            self.deferred += 1
+            return False
+
+    def is_open(self):
+        """열려 있고 대기 시간이 남았는지 (상태를 바꾸지 않음)"""
+        with self._guard():
+            return self.state == self.OPEN and self.clock() - self.opened_at < self.cooldown
+
+    def retry_after(self):
+        """보류된 계정을 다시 시도하기까지 기다릴 시간(초)"""
+        with self._guard():
+            if self.state == self.OPEN:
+                return max(0.0, self.cooldown - (self.clock() - self.opened_at))
+            return BREAKER_PROBE_WAIT if self.state == self.HALF_OPEN else 0.0
+
+    def record_success(self):
+        with self._guard():
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED, "계정 처리 성공")
+            self.consecutive = 0
+            self.last_kind = None
+
+    def record_failure(self, kind):
+        with self._guard():
+            if kind not in BREAKER_FAILURE_KINDS:
+                # 비밀번호 오류, 드라이버 오류 등 사이트 장애로 볼 수 없는 실패는 연속 기록만 끊고,
+                # half-open이면 다른 계정이 다시 확인하도록 자리만 비움
+                if self.state == self.HALF_OPEN:
+                    self.probe_in_flight = False
+                else:
+                    self.consecutive = 0
+                    self.last_kind = None
+                return
+
+            if self.state == self.HALF_OPEN:
+                self._transition(self.OPEN, f"확인 계정 실패 ({kind})")
+                return
+            if self.state == self.OPEN or self.threshold <= 0:
+                return
+
+            self.consecutive = self.consecutive + 1 if kind == self.last_kind else 1
+            self.last_kind = kind
+            if self.consecutive >= self.threshold:
+                self._transition(self.OPEN, f"{kind} 연속 {self.consecutive}회")
+
+    def force_open(self, reason):
+        """사전 점검 실패 등으로 바로 열기"""
+        with self._guard():
+            if self.threshold > 0 and self.state != self.OPEN:
+                self._transition(self.OPEN, reason)
+
+    def snapshot(self):
+        """실행 보고서용 상태"""
+        with self._guard():
+            return {
+                "state": self.state,
+                "threshold": self.threshold,
+                "cooldown": self.cooldown,
+                "last_kind": self.last_kind,
+                "consecutive": self.consecutive,
+                "deferred": self.deferred,
+                "transitions": list(self.transitions),
+                "preflight": self.preflight,
+            }
+
+class SharedCircuitBreaker(CircuitBreaker):
+    """샤드 프로세스(와 같은 실행 구분값을 쓰는 다른 호스트)가 작업 큐 DB의 한 행으로 상태를 공유하는 차단기"""
+
+    SHARED_FIELDS = (
+        "state", "last_kind", "consecutive", "opened_at", "probe_in_flight", "probe_at", "deferred", "transitions",
+    )
+
+    def __init__(self, queue_db, key, threshold, cooldown):
+        super().__init__(threshold, cooldown)
+        self.queue_db = queue_db
+        self.key = key
+        self.clock = time.time  # 프로세스/호스트 사이에서 비교할 수 있는 시각
+
+    @contextmanager
+    def _guard(self):
+        """DB 행을 잠그고 읽어 온 상태로 판단한 뒤 다시 저장 (DB 오류 시 이 프로세스 상태만 사용)"""
+        with self.lock:
+            conn = None
+            try:
+                conn = _connect_queue_db(self.queue_db)
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT data FROM breaker WHERE key = ?", (self.key,)).fetchone()
+                if row:
+                    for name, value in json.loads(row[0]).items():
+                        setattr(self, name, value)
+            except sqlite3.Error as e:
+                logger.warning(f"공유 차단기 상태 읽기 실패 - 이 프로세스 상태로 판단: {e}")
+                if conn is not None:
+                    conn.close()
+                    conn = None
+
+            try:
+                yield
+            finally:
+                if conn is not None:
+                    try:
+                        data = json.dumps({name: getattr(self, name) for name in self.SHARED_FIELDS}, ensure_ascii=False)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO breaker (key, data, updated_at) VALUES (?, ?, ?)",
+                            (self.key, data, time.time()),
+                        )
+                        conn.execute("COMMIT")
+                    except sqlite3.Error as e:
+                        logger.warning(f"공유 차단기 상태 저장 실패: {e}")
+                    finally:
+                        conn.close()
+
+_circuit_breaker = None
+_circuit_breaker_lock = threading.Lock()
+
+def get_breaker_settings():
+    """차단기 설정 (YESFILE_BREAKER_THRESHOLD 연속 실패 수, 0이면 끔 / YESFILE_BREAKER_COOLDOWN 초)"""
+    try:
+        threshold = int(os.environ.get('YESFILE_BREAKER_THRESHOLD', 5))
+    except ValueError:
+        threshold = 5
+    try:
+        cooldown = float(os.environ.get('YESFILE_BREAKER_COOLDOWN', 120))
+    except ValueError:
+        cooldown = 120.0
+    return threshold, cooldown
+
+def get_circuit_breaker():
+    """모든 워커가 공유하는 차단기 (shard 엔진이면 작업 큐 DB로 샤드 프로세스와도 공유)"""
+    global _circuit_breaker
+    with _circuit_breaker_lock:
+        if _circuit_breaker is None:
+            if os.environ.get('YESFILE_ENGINE', 'thread').lower() == 'shard':
+                _circuit_breaker = SharedCircuitBreaker(SHARD_QUEUE_DB, SHARD_RUN_ID, *get_breaker_settings())
+            else:
+                _circuit_breaker = CircuitBreaker(*get_breaker_settings())
+        return _circuit_breaker
+
+def deferred_result(username, breaker):
+    """차단기가 열려 실행하지 않은 계정의 결과 (재시도 대상)"""
+    return {
+        "username": username, "success": False, "error": "차단기 열림 - 사이트 장애 의심으로 보류",
+        "error_type": ERROR_CIRCUIT_OPEN, "error_detail": None, "elapsed": 0,
+        "retry_after": round(breaker.retry_after(), 1),
+    }
+
+def preflight_check():
+    """실행 전에 로그인 페이지를 한 번 받아 사이트 상태 확인 (접속 실패/5xx면 차단기를 바로 엶)"""
+    breaker = get_circuit_breaker()
+    with span("preflight") as record:
+        problem = None
+        try:
+            response = requests.get(LOGIN_URL, timeout=PREFLIGHT_TIMEOUT, headers={"User-Agent": HTTP_USER_AGENT})
+            record["status"] = response.status_code
+            if response.status_code >= 500:
+                problem = f"HTTP {response.status_code}"
+            elif _is_challenge(response):
+                # 챌린지는 브라우저가 통과할 수 있으므로 장애로 보지 않음
+                record["challenge"] = True
             else:
-                logger.warning("출석체크를 완료할 수 없었습니다.")
+                # 폼이 JavaScript로 그려질 수도 있으므로 기록만 함
+                record["login_form"] = 'type="password"' in response.text.lower()
+        except requests.RequestException as e:
+            problem = type(e).__name__
+
+        if problem:
+            record["outcome"] = "fail"
+            record["problem"] = problem
+            logger.warning(f"사전 점검 실패: {LOGIN_URL} ({problem}) - 남은 계정 보류")
+            breaker.force_open(f"사전 점검 실패 ({problem})")
+        else:
+            logger.info(f"사전 점검 통과: {LOGIN_URL} (HTTP {record['status']})")
+
+    breaker.preflight = {k: v for k, v in record.items() if k not in ("account", "step")}
+    return problem is None
+
+def new_worker_state():
+    """워커 하나가 재사용하는 브라우저 상태"""
+    return {"driver": None, "accounts_served": 0}
+
+def process_account(account, state):
+    """워커 상태의 브라우저(없으면 새로 실행)로 계정 하나 처리 후 결과 dict 반환"""
+    username = account["username"]
+    result = {"username": username, "success": False, "error": None, "error_type": None}
+    started = time.time()
+    reset_failure()
+    reset_page_states()
+
+    # 사이트 장애가 의심되면 타임아웃을 기다리지 않고 바로 보류
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        logger.info(f"[{username}] 차단기 열림 - 보류")
+        return deferred_result(username, breaker)
+
+    try:
+        # HTTP 방식으로 끝나면 브라우저를 띄우지 않음
+        http_result = run_http_first(username, account["password"])
+        if http_result is not None:
+            result["success"] = http_result
+            return result
+
+        if state["driver"] is not None:
+            state["driver"] = reuse_or_recycle_driver(state["driver"], state["accounts_served"])
+
+        if state["driver"] is None:
+            state["accounts_served"] = 0
+            # 크롬이 뜨는 동안 DNS/TLS 예열과 이벤트 페이지 확인을 함께 진행
+            start_prefetch()
+            state["driver"] = setup_driver()
+            if not state["driver"]:
+                result["error"] = "드라이버 설정 실패"
+                mark_failure(ERROR_DRIVER_CRASH)
+                return result
+
+        state["accounts_served"] += 1
+
+        result["success"] = run_account(
+            state["driver"], username, account["password"], account.get("session_ttl")
+        )
+
+    except WebDriverException as e:
+        # 브라우저가 죽었으면 다음 계정에서 새로 띄운다
+        logger.error(f"[{username}] 드라이버 오류로 브라우저 재시작: {e}")
+        result["error"] = str(e).strip().splitlines()[0] if str(e).strip() else "WebDriverException"
+        if isinstance(e, TimeoutException):
+            mark_failure(ERROR_TIMEOUT, FAILURE_PAGE_LOAD)
+        else:
+            mark_failure(ERROR_DRIVER_CRASH)
+        if state["driver"]:
+            quit_driver(state["driver"])
+        state["driver"] = None
+    except Exception as e:
+        logger.error(f"[{username}] 처리 중 오류: {e}")
+        logger.error(f"상세 오류: {traceback.format_exc()}")
+        result["error"] = str(e)
+    finally:
+        result["elapsed"] = round(time.time() - started, 2)
+        if result["success"]:
+            breaker.record_success()
+            if is_unverified():
+                result["unverified"] = True
+        else:
+            result["error_type"] = get_failure() or ERROR_UNKNOWN
+            result["error_detail"] = get_failure_detail()
+            breaker.record_failure(result["error_detail"])
+
+    return result
+
+def _batch_worker(account_queue, results, results_lock):
+    """워커 스레드: 자신의 드라이버 하나로 큐의 계정을 차례로 처리"""
+    state = new_worker_state()
+    try:
+        while True:
+            try:
+                account = account_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            result = process_account(account, state)
+            with results_lock:
+                results.append(result)
+            account_queue.task_done()
+    finally:
+        if state["driver"]:
+            quit_driver(state["driver"])
+
+def run_batch(accounts, workers):
+    """고정 크기 워커 풀로 여러 계정 출석체크"""
+    account_queue = queue.Queue()
+    for account in accounts:
+        account_queue.put(account)
+
+    workers = max(1, min(workers, len(accounts)))
+    logger.info(f"배치 실행 시작: 계정 {len(accounts)}개, 워커 {workers}개")
+
+    results = []
+    results_lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=_batch_worker,
+            args=(account_queue, results, results_lock),
+            name=f"worker-{i + 1}",
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    log_batch_summary(results, time.time() - started)
+    return results
+
+def log_batch_summary(results, elapsed):
+    """배치 실행 결과 요약 출력"""
+    succeeded = [r for r in results if r["success"]]
+    failed = [r for r in results if not r["success"]]
+
+    logger.info("=== 배치 실행 요약 ===")
+    logger.info(f"전체: {len(results)}개, 성공: {len(succeeded)}개, 실패: {len(failed)}개, 소요 시간: {elapsed:.1f}초")
+    with _driver_metrics_lock:
+        startup_times = list(_driver_startup_times)
+    if startup_times:
+        logger.info(
+            f"드라이버 시작: {len(startup_times)}회, 평균 {sum(startup_times) / len(startup_times):.2f}초, "
+            f"최대 {max(startup_times):.2f}초"
+        )
+    for r in failed:
+        logger.warning(f"실패 계정: {r['username']} ({r['error'] or '출석체크 실패'}, {r['elapsed']}초)")
+
+# === asyncio 실행 엔진 ===
+
+class _AsyncRateLimiter:
+    """초당 시작 횟수 제한 (요청이 몰리지 않도록 시작 시각을 일정 간격으로 분산)"""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def get_async_settings():
+    """asyncio 엔진 설정 (YESFILE_RATE 초당 시작 계정 수, YESFILE_ACCOUNT_DEADLINE 계정별 제한 시간)"""
+    try:
+        rate = float(os.environ.get('YESFILE_RATE', 2))
+    except ValueError:
+        rate = 2.0
+    try:
+        deadline = float(os.environ.get('YESFILE_ACCOUNT_DEADLINE', 300))
+    except ValueError:
+        deadline = 300.0
+    return rate, deadline
+
+async def run_async_batch(accounts, concurrency):
+    """asyncio로 여러 계정을 동시에 처리 (브라우저 작업은 세마포어 아래 스레드에서 실행)"""
+    rate, deadline = get_async_settings()
+    concurrency = max(1, min(concurrency, len(accounts)))
+    logger.info(
+        f"asyncio 배치 실행 시작: 계정 {len(accounts)}개, 동시 실행 {concurrency}개, "
+        f"초당 {rate}개 시작, 계정별 제한 {deadline:.0f}초"
+    )
+
+    loop = asyncio.get_running_loop()
+    # 제한 시간을 넘긴 스레드는 브라우저가 닫힐 때까지 남아 있을 수 있으므로 여유 스레드를 둠
+    executor = ThreadPoolExecutor(max_workers=concurrency * 2, thread_name_prefix="async-worker")
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = _AsyncRateLimiter(rate)
+    thread_states = threading.local()
+    all_states = []
+    states_lock = threading.Lock()
+
+    def run_in_thread(account, holder, begun):
+        loop.call_soon_threadsafe(lambda: begun.done() or begun.set_result(time.time()))
+        # 실행 스레드마다 브라우저 하나를 계속 재사용
+        state = getattr(thread_states, "state", None)
+        if state is None:
+            state = thread_states.state = new_worker_state()
+            with states_lock:
+                all_states.append(state)
+        holder["state"] = state
+        return process_account(account, state)
+
+    async def run_one(account):
+        username = account["username"]
+        async with semaphore:
+            await limiter.wait()
+            holder = {}
+            started = time.time()
+            begun = loop.create_future()
+            future = loop.run_in_executor(executor, run_in_thread, account, holder, begun)
+            try:
+                # 제한 시간은 스레드에서 실제로 시작한 때부터 (빈 스레드를 기다린 시간은 제외)
+                await asyncio.wait_for(asyncio.shield(begun), deadline)
+                return await asyncio.wait_for(future, max(0.0, begun.result() + deadline - time.time()))
+            except asyncio.TimeoutError:
+                if not begun.done():
+                    future.cancel()
+                    logger.error(f"[{username}] {deadline:.0f}초 동안 실행 스레드를 얻지 못함")
+                    return {
+                        "username": username, "success": False, "error": "실행 스레드 대기 시간 초과",
+                        "error_type": ERROR_TIMEOUT, "elapsed": round(time.time() - started, 2),
+                    }
+                # 막혀 있는 WebDriver 호출을 끊기 위해 해당 브라우저 종료
+                logger.error(f"[{username}] 제한 시간 {deadline:.0f}초 초과 - 브라우저 종료")
+                state = holder.get("state")
+                if state and state["driver"]:
+                    quit_driver(state["driver"])
+                    state["driver"] = None
+                return {
+                    "username": username, "success": False, "error": "제한 시간 초과",
+                    "error_type": ERROR_TIMEOUT, "elapsed": round(time.time() - started, 2),
+                }
+
+    started = time.time()
+    try:
+        results = await asyncio.gather(*(run_one(account) for account in accounts))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        with states_lock:
+            for state in all_states:
+                if state["driver"]:
+                    quit_driver(state["driver"])
+                    state["driver"] = None
+
+    results = list(results)
+    log_batch_summary(results, time.time() - started)
+    return results
+
+# === 멀티 프로세스 샤드 실행 (공유 SQLite 작업 큐) ===
+
+# 작업 큐 DB: 여러 호스트가 같은 파일(공유 파일시스템)을 보면 함께 처리
+# 계정 이름만 저장하고 비밀번호는 넣지 않음 (각 프로세스는 자신이 받은 계정 목록에서 찾음)
+# WAL은 공유 메모리가 필요해 네트워크 파일시스템에서 쓸 수 없으므로 기본 저널 모드 사용
+SHARD_QUEUE_DB = os.environ.get('YESFILE_QUEUE_DB', 'yesfile_queue.db')
+SHARD_POLL_INTERVAL = 2.0
+SHARD_RETENTION = 2 * 24 * 60 * 60  # 이보다 오래된 배치/차단기 행과 샤드 기록 파일은 실행 시 삭제
+# 실행 구분값: 같은 날 다시 실행해도 이전 배치의 결과를 재사용하지 않음
+# 여러 호스트가 한 배치를 나눠 처리하려면 모두 같은 YESFILE_SHARD_RUN_ID를 지정 (예: CI 실행 번호)
+SHARD_RUN_ID = os.environ.get('YESFILE_SHARD_RUN_ID') or secrets.token_hex(8)
+
+JOB_PENDING = "pending"
+JOB_CLAIMED = "claimed"
+JOB_DONE = "done"
+
+_shard_round = 0
+
+def _connect_queue_db(path):
+    """작업 큐 DB 연결 (트랜잭션은 BEGIN IMMEDIATE로 직접 관리)"""
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            batch_id TEXT NOT NULL,
+            username TEXT NOT NULL,
+            status TEXT NOT NULL,
+            worker TEXT,
+            claimed_at REAL,
+            finished_at REAL,
+            result TEXT,
+            enqueued_at REAL,
+            PRIMARY KEY (batch_id, username)
+        )
+        """
+    )
+    # 이전 버전에서 만든 큐 DB에는 enqueued_at이 없음
+    if "enqueued_at" not in {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}:
+        conn.execute("ALTER TABLE jobs ADD COLUMN enqueued_at REAL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_batch_status ON jobs (batch_id, status)")
+    conn.execute("CREATE TABLE IF NOT EXISTS breaker (key TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL)")
+    return conn
+
+def make_batch_id(usernames, round_no):
+    """날짜, 실행 구분값, 실행 차수, 계정 목록으로 배치 ID 생성 (같은 실행 구분값을 쓴 호스트끼리 배치를 공유)"""
+    key = "\n".join([kst_today(), SHARD_RUN_ID, str(round_no)] + sorted(usernames))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def enqueue_batch(conn, batch_id, usernames):
+    """배치 작업 등록 (이미 다른 호스트가 등록했으면 그대로 둠)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (batch_id, username, status, enqueued_at) VALUES (?, ?, ?, ?)",
+            [(batch_id, username, JOB_PENDING, now) for username in usernames],
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def claim_job(conn, batch_id, worker_id):
+    """대기 중인 작업 하나를 가져감 (없으면 None)"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT username FROM jobs WHERE batch_id = ? AND status = ? ORDER BY rowid LIMIT 1",
+            (batch_id, JOB_PENDING),
+        ).fetchone()
+        if row:
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, claimed_at = ? WHERE batch_id = ? AND username = ?",
+                (JOB_CLAIMED, worker_id, time.time(), batch_id, row[0]),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row[0] if row else None
+
+def complete_job(conn, batch_id, username, result):
+    """작업 결과 저장"""
+    conn.execute(
+        "UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE batch_id = ? AND username = ?",
+        (JOB_DONE, time.time(), json.dumps(result, ensure_ascii=False), batch_id, username),
+    )
+
+def prune_shard_queue(conn, queue_db, retention=SHARD_RETENTION):
+    """오래된 배치 작업, 차단기 상태, 남은 샤드 기록 파일 삭제 (실행 구분값이 매번 달라 계속 쌓이므로)"""
+    cutoff = time.time() - retention
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        jobs = conn.execute(
+            "DELETE FROM jobs WHERE COALESCE(enqueued_at, finished_at, claimed_at, 0) < ?", (cutoff,)
+        ).rowcount
+        breakers = conn.execute("DELETE FROM breaker WHERE COALESCE(updated_at, 0) < ?", (cutoff,)).rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    files = 0
+    pattern = os.path.join(os.path.dirname(queue_db) or ".", "yesfile_shard_*.json")
+    for path in glob.glob(pattern):
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                files += 1
+        except OSError:
+            continue
+    if jobs or breakers or files:
+        logger.info(f"오래된 샤드 기록 정리: 작업 {jobs}개, 차단기 {breakers}개, 파일 {files}개")
+
+def _shard_result_path(queue_db, batch_id, worker_id):
+    """샤드별 구간 기록 파일 (큐 DB와 같은 폴더)"""
+    safe_worker = re.sub(r"[^A-Za-z0-9_.-]", "_", worker_id)
+    return os.path.join(os.path.dirname(queue_db) or ".", f"yesfile_shard_{batch_id}_{safe_worker}.json")
+
+def _shard_worker(queue_db, batch_id, accounts, breaker_key):
+    """샤드 프로세스: 큐에서 계정을 하나씩 가져와 자신의 브라우저로 처리"""
+    global _circuit_breaker
+    threading.current_thread().name = multiprocessing.current_process().name
+    # 부모 프로세스, 다른 샤드와 같은 차단기 상태를 씀
+    _circuit_breaker = SharedCircuitBreaker(queue_db, breaker_key, *get_breaker_settings())
+    worker_id = shard_worker_id()
+    accounts_by_name = {a["username"]: a for a in accounts}
+    state = new_worker_state()
+    served = 0
+
+    with closing(_connect_queue_db(queue_db)) as conn:
+        try:
+            while True:
+                username = claim_job(conn, batch_id, worker_id)
+                if username is None:
+                    break
+                result = process_account(accounts_by_name[username], state)
+                complete_job(conn, batch_id, username, result)
+                served += 1
+        finally:
+            if state["driver"]:
+                quit_driver(state["driver"])
+
+            with _spans_lock:
+                spans = list(_spans)
+            try:
+                with open(_shard_result_path(queue_db, batch_id, worker_id), "w", encoding="utf-8") as f:
+                    json.dump({"worker": worker_id, "accounts": served, "spans": spans}, f, ensure_ascii=False)
+            except OSError as e:
+                logger.warning(f"샤드 결과 저장 실패: {e}")
+
+def _mem_available_mb():
+    """사용 가능한 메모리(MB) (/proc/meminfo가 없으면 None)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+def get_shard_worker_count(account_count):
+    """샤드 프로세스 수 (YESFILE_SHARD_WORKERS, 없으면 CPU 수와 여유 메모리 / YESFILE_BROWSER_MB로 계산)"""
+    try:
+        return max(1, min(int(os.environ.get('YESFILE_SHARD_WORKERS', '')), account_count))
+    except ValueError:
+        pass
+
+    try:
+        browser_mb = float(os.environ.get('YESFILE_BROWSER_MB', 500))
+    except ValueError:
+        browser_mb = 500.0
+    cpu_count = os.cpu_count() or 1
+    available_mb = _mem_available_mb()
+    by_memory = int(available_mb // browser_mb) if available_mb and browser_mb > 0 else cpu_count
+    return max(1, min(cpu_count, by_memory, account_count))
+
+def get_shard_lease():
+    """다른 호스트가 가져간 작업을 기다리는 최대 시간 (YESFILE_SHARD_LEASE, 초)"""
+    try:
+        return float(os.environ.get('YESFILE_SHARD_LEASE', 600))
+    except ValueError:
+        return 600.0
+
+def shard_worker_id(pid=None):
+    """작업 큐에 기록하는 샤드 프로세스 ID (호스트 이름-pid)"""
+    return f"{socket.gethostname()}-{pid or os.getpid()}"
+
+def collect_shard_results(conn, batch_id, usernames, finished_workers=()):
+    """배치 결과 수집 (다른 호스트가 처리 중인 작업은 기다리고, 끝나지 않은 작업은 실패로 처리)
+
+    finished_workers: 이미 종료된 이 호스트의 샤드 프로세스 ID - 이들이 가져간 작업은 기다리지 않음
+    """
+    lease = get_shard_lease()
+    finished_workers = set(finished_workers)
+    while True:
+        rows = conn.execute(
+            "SELECT username, status, claimed_at, result, worker FROM jobs WHERE batch_id = ?", (batch_id,)
+        ).fetchall()
+        now = time.time()
+        in_progress = [
+            r for r in rows
+            if r[1] == JOB_CLAIMED and now - r[2] < lease and r[4] not in finished_workers
+        ]
+        if not in_progress:
+            break
+        logger.info(f"다른 프로세스가 처리 중인 계정 {len(in_progress)}개 대기")
+        time.sleep(SHARD_POLL_INTERVAL)
+
+    results = {}
+    for username, status, _, result, _ in rows:
+        if status == JOB_DONE:
+            results[username] = json.loads(result)
+        else:
+            # 처리하던 프로세스가 죽었거나 시간을 넘김 - 재시도 대상으로 보고
+            results[username] = {
+                "username": username, "success": False, "error": "샤드 작업 미완료",
+                "error_type": ERROR_DRIVER_CRASH, "error_detail": None, "elapsed": 0,
+            }
+    return [results[u] for u in usernames if u in results]
+
+def merge_shard_spans(queue_db, batch_id, worker_ids):
+    """이 호스트의 샤드 프로세스들이 남긴 구간 기록을 보고서에 합치고 파일 삭제"""
+    merged = 0
+    for worker_id in worker_ids:
+        path = _shard_result_path(queue_db, batch_id, worker_id)
+        try:
+            with open(path, encoding="utf-8") as f:
+                shard = json.load(f)
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logger.warning(f"샤드 결과 읽기 실패 ({path}): {e}")
+            continue
+        for record in shard["spans"]:
+            record["worker"] = shard["worker"]
+        with _spans_lock:
+            _spans.extend(shard["spans"])
+        merged += 1
+    return merged
+
+def run_shard_batch(accounts):
+    """계정 목록을 공유 작업 큐에 넣고 샤드 프로세스들로 처리"""
+    global _shard_round
+    _shard_round += 1
+    usernames = [a["username"] for a in accounts]
+    batch_id = make_batch_id(usernames, _shard_round)
+    # half-open 확인 계정은 샤드 프로세스가 고르도록 여기서는 상태만 봄
+    breaker = get_circuit_breaker()
+    if breaker.is_open():
+        logger.warning(f"차단기 열림 - 계정 {len(accounts)}개 샤드 실행 보류")
+        return [deferred_result(username, breaker) for username in usernames]
+
+    workers = get_shard_worker_count(len(accounts))
+    logger.info(
+        f"샤드 실행 시작: 계정 {len(accounts)}개, 프로세스 {workers}개, "
+        f"큐 {SHARD_QUEUE_DB} (배치 {batch_id})"
+    )
+
+    started = time.time()
+    with closing(_connect_queue_db(SHARD_QUEUE_DB)) as conn:
+        if _shard_round == 1:
+            prune_shard_queue(conn, SHARD_QUEUE_DB)
+        enqueue_batch(conn, batch_id, usernames)
+
+        # spawn: 부모의 스레드/잠금 상태를 물려받지 않도록 새 인터프리터로 시작
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(
+                target=_shard_worker,
+                args=(SHARD_QUEUE_DB, batch_id, accounts, SHARD_RUN_ID),
+                name=f"shard-{i + 1}",
+            )
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                logger.warning(f"{process.name} 비정상 종료 (exit {process.exitcode})")
+
+        # 종료된 프로세스가 가져간 채 남은 작업은 임대 시간을 기다리지 않고 바로 실패 처리
+        finished_workers = [shard_worker_id(process.pid) for process in processes]
+        results = collect_shard_results(conn, batch_id, usernames, finished_workers)
+
+    merged = merge_shard_spans(SHARD_QUEUE_DB, batch_id, finished_workers)
+    logger.info(f"샤드 구간 기록 {merged}개 병합")
+    log_batch_summary(results, time.time() - started)
+    return results
+
+# === 일별 출석 상태 저장소 (SQLite) ===
+
+STATE_DB_FILE = os.environ.get('YESFILE_STATE_DB', 'yesfile_state.db')
+KST = timezone(timedelta(hours=9))
+
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILED = "failed"
+OUTCOME_UNVERIFIED = "unverified"  # 버튼은 눌렀지만 완료 문구 미확인 - 건너뛰지 않음
+
+def kst_today():
+    """한국 시간 기준 오늘 날짜 (YYYY-MM-DD)"""
+    return datetime.now(KST).date().isoformat()
+
+def _connect_state_db():
+    """상태 DB 연결 (없으면 테이블/인덱스 생성)"""
+    conn = sqlite3.connect(STATE_DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS attendance (
+            username TEXT NOT NULL,
+            kst_date TEXT NOT NULL,
+            outcome TEXT NOT NULL,
+            error_type TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            recorded_at REAL NOT NULL,
+            PRIMARY KEY (username, kst_date)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_attendance_date_outcome ON attendance (kst_date, outcome)")
+    return conn
+
+def record_attendance(username, success, error_type=None, attempts=0, date=None, verified=True):
+    """계정의 날짜별 결과 기록 (이미 성공한 날은 실패로 덮어쓰지 않음)"""
+    if success:
+        outcome = OUTCOME_SUCCESS if verified else OUTCOME_UNVERIFIED
+    else:
+        outcome = OUTCOME_FAILED
+    try:
+        with closing(_connect_state_db()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO attendance (username, kst_date, outcome, error_type, attempts, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (username, kst_date) DO UPDATE SET
+                    outcome = excluded.outcome,
+                    error_type = excluded.error_type,
+                    attempts = attendance.attempts + excluded.attempts,
+                    recorded_at = excluded.recorded_at
+                WHERE attendance.outcome != 'success'
+                """,
+                (
+                    username, date or kst_today(), outcome,
+                    None if success else error_type, attempts, time.time(),
+                ),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"[{username}] 출석 상태 저장 실패: {e}")
+
+def attended_today(usernames=None):
+    """오늘 출석에 성공한 계정 집합 (인덱스 조회 한 번)"""
+    try:
+        with closing(_connect_state_db()) as conn:
+            rows = conn.execute(
+                "SELECT username FROM attendance WHERE kst_date = ? AND outcome = ?",
+                (kst_today(), OUTCOME_SUCCESS),
+            ).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"출석 상태 조회 실패: {e}")
+        return set()
+
+    attended = {row[0] for row in rows}
+    return attended if usernames is None else attended & set(usernames)
+
+def _success_dates(conn, username, since):
+    """since 이후 출석에 성공한 날짜 집합"""
+    rows = conn.execute(
+        "SELECT kst_date FROM attendance WHERE username = ? AND outcome = ? AND kst_date >= ?",
+        (username, OUTCOME_SUCCESS, since),
+    ).fetchall()
+    return {row[0] for row in rows}
+
+def get_streak(username):
+    """오늘(아직 안 했으면 어제)까지 연속 출석 일수"""
+    today = datetime.now(KST).date()
+    with closing(_connect_state_db()) as conn:
+        dates = _success_dates(conn, username, "0000-00-00")
+
+    day = today if today.isoformat() in dates else today - timedelta(days=1)
+    streak = 0
+    while day.isoformat() in dates:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak
+
+def get_missed_days(username, days=30):
+    """최근 days일(오늘 제외) 중 출석하지 못한 날짜 목록"""
+    today = datetime.now(KST).date()
+    since = (today - timedelta(days=days)).isoformat()
+    with closing(_connect_state_db()) as conn:
+        dates = _success_dates(conn, username, since)
+    return [
+        (today - timedelta(days=offset)).isoformat()
+        for offset in range(days, 0, -1)
+        if (today - timedelta(days=offset)).isoformat() not in dates
+    ]
+
+def log_attendance_status(usernames):
+    """계정별 오늘 출석 여부, 연속 출석 일수, 최근 30일 결석 일수 출력"""
+    attended = attended_today(usernames)
+    logger.info(f"=== 출석 현황 ({kst_today()}) ===")
+    for username in usernames:
+        logger.info(
+            f"{username}: 오늘 {'완료' if username in attended else '미완료'}, "
+            f"연속 {get_streak(username)}일, 최근 30일 결석 {len(get_missed_days(username))}일"
+        )
+
+# === 재시도 스케줄러 ===
+
+DEAD_LETTER_FILE = os.environ.get('YESFILE_DEAD_LETTER_FILE', 'yesfile_dead_letter.jsonl')
+
+def get_retry_settings():
+    """재시도 설정 (YESFILE_RETRY_ATTEMPTS 최대 시도 횟수, YESFILE_RETRY_BASE_DELAY/MAX_DELAY 대기 초)"""
+    def read(name, default, cast):
+        try:
+            return cast(os.environ.get(name, default))
+        except ValueError:
+            return default
+    return (
+        max(1, read('YESFILE_RETRY_ATTEMPTS', 3, int)),
+        read('YESFILE_RETRY_BASE_DELAY', 30.0, float),
+        read('YESFILE_RETRY_MAX_DELAY', 600.0, float),
+    )
+
+def get_max_deferrals():
+    """계정 하나를 차단기로 보류할 수 있는 최대 횟수 (YESFILE_BREAKER_MAX_DEFERRALS)"""
+    try:
+        return max(0, int(os.environ.get('YESFILE_BREAKER_MAX_DEFERRALS', 10)))
+    except ValueError:
+        return 10
+
+def retry_delay(attempt, base_delay, max_delay):
+    """지수 백오프 + 지터 (attempt는 1부터)"""
+    return min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+def write_dead_letter(result):
+    """재시도를 포기한 계정을 dead-letter 파일에 추가 (비밀번호는 저장하지 않음)"""
+    entry = {
+        "username": result["username"],
+        "date": kst_today(),
+        "error_type": result.get("error_type"),
+        "error": result.get("error"),
+        "attempts": result.get("attempts"),
+        "recorded_at": time.time(),
+    }
+    try:
+        with open(DEAD_LETTER_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        logger.warning(f"[{result['username']}] dead-letter 기록: {entry['error_type']} ({entry['attempts']}회 시도)")
+    except OSError as e:
+        logger.warning(f"dead-letter 기록 실패: {e}")
+
+def run_with_retries(accounts, run_round):
+    """실패한 계정만 백오프 후 다시 실행하고, 오늘 이미 출석한 계정은 드라이버 생성 전에 건너뜀"""
+    max_attempts, base_delay, max_delay = get_retry_settings()
+    attended = attended_today([a["username"] for a in accounts])
+
+    final = {}
+    pending = []
+    for account in accounts:
+        if account["username"] in attended:
+            logger.info(f"[{account['username']}] 오늘 이미 출석 완료 - 건너뜀")
+            final[account["username"]] = {
+                "username": account["username"], "success": True, "skipped": True,
+                "error": None, "error_type": None, "elapsed": 0, "attempts": 0,
+            }
+        else:
+            pending.append(account)
+
+    attempts = {}
+    deferrals = {}
+    next_at = {}
+    max_deferrals = get_max_deferrals()
+    while pending:
+        now = time.time()
+        ready = [a for a in pending if next_at.get(a["username"], 0) <= now]
+        if not ready:
+            time.sleep(max(0.0, min(next_at[a["username"]] for a in pending) - now))
+            continue
+
+        pending = [a for a in pending if a not in ready]
+        accounts_by_name = {a["username"]: a for a in ready}
+
+        deferred = 0
+        for result in run_round(ready):
+            username = result["username"]
+
+            # 차단기로 보류된 계정은 시도 횟수에 넣지 않고 차단기가 다시 열어볼 때까지 대기
+            if result.get("error_type") == ERROR_CIRCUIT_OPEN and deferrals.get(username, 0) < max_deferrals:
+                deferrals[username] = deferrals.get(username, 0) + 1
+                next_at[username] = time.time() + result.get("retry_after", base_delay) + random.uniform(0, 5)
+                pending.append(accounts_by_name[username])
+                deferred += 1
+                continue
+
+            attempts[username] = attempts.get(username, 0) + 1
+            result["attempts"] = attempts[username]
+
+            if result["success"]:
+                final[username] = result
+                record_attendance(
+                    username, True, attempts=attempts[username], verified=not result.get("unverified")
+                )
+                continue
+
+            error_type = result.get("error_type") or ERROR_UNKNOWN
+            if error_type in RETRYABLE_ERRORS and attempts[username] < max_attempts:
+                delay = retry_delay(attempts[username], base_delay, max_delay)
+                logger.info(
+                    f"[{username}] {error_type} 실패 - {delay:.0f}초 후 재시도 "
+                    f"({attempts[username] + 1}/{max_attempts})"
+                )
+                next_at[username] = time.time() + delay
+                pending.append(accounts_by_name[username])
+            else:
+                final[username] = result
+                record_attendance(username, False, error_type, attempts=attempts[username])
+                write_dead_letter(result)
+
+        if deferred:
+            logger.info(f"차단기로 보류된 계정 {deferred}개 - 사이트 복구 확인 후 다시 실행")
+
+    return [final[a["username"]] for a in accounts if a["username"] in final]
+
+def get_worker_count():
+    """배치 워커 수 / asyncio 엔진의 동시 실행 수 (YESFILE_WORKERS, 기본값은 CPU 수 기준)"""
+    try:
+        return max(1, int(os.environ.get('YESFILE_WORKERS', '')))
+    except ValueError:
+        return max(1, min(4, os.cpu_count() or 1))
+
+def run_accounts_round(accounts):
+    """설정된 엔진(YESFILE_ENGINE: thread / async / shard)으로 계정 목록 한 차례 실행"""
+    engine = os.environ.get('YESFILE_ENGINE', 'thread').lower()
+    if engine == 'async':
+        return asyncio.run(run_async_batch(accounts, get_worker_count()))
+    if engine == 'shard':
+        return run_shard_batch(accounts)
+    return run_batch(accounts, get_worker_count())
+
+def main():
+    """메인 함수"""
+    results = []
+    started_run = False  # 조회 모드/계정 없음으로 끝나면 지난 실행 보고서를 덮어쓰지 않음
+    try:
+        logger.info("=== 예스파일 자동 출석체크 시작 (JavaScript 활성화) ===")
+        logger.info(f"실행 환경: {'GitHub Actions' if os.environ.get('GITHUB_ACTIONS') else '로컬'}")
+
+        # 배치 모드: 계정 목록 파일이 지정된 경우
+        accounts_file = os.environ.get('YESFILE_ACCOUNTS_FILE')
+        if accounts_file:
+            accounts = load_accounts(accounts_file)
+            if not accounts:
+                logger.error("처리할 계정이 없습니다.")
                 return False
         else:
-            logger.error("로그인에 실패했습니다.")
-            return False
+            # 로그인 정보 가져오기
+            username, password = get_login_credentials()
+            if not username or not password:
+                logger.error("로그인 정보가 없습니다.")
+                return False
+            accounts = [{"username": username, "password": password}]
+
+        # 조회 모드: 출석 없이 계정별 현황만 출력
+        if os.environ.get('YESFILE_MODE', '').strip().lower() == 'status':
+            log_attendance_status([a["username"] for a in accounts])
+            return True
+
+        started_run = True
+
+        # 사이트가 응답하지 않으면 차단기를 먼저 열어 계정마다 타임아웃을 기다리지 않음
+        if os.environ.get('YESFILE_PREFLIGHT', '1').lower() not in ('0', 'false', 'no'):
+            preflight_check()
+
+        # 로그인 및 출석체크 (실패한 계정은 백오프 후 재시도)
+        results = run_with_retries(accounts, run_accounts_round)
+        return all(r["success"] for r in results)
 
     except KeyboardInterrupt:
         logger.info("\n사용자에 의해 중단되었습니다.")
@@ -514,13 +3164,9 @@ def main():
         logger.error(f"상세 오류: {traceback.format_exc()}")
         return False
     finally:
+        if started_run:
+            write_run_report(results, {"circuit_breaker": get_circuit_breaker().snapshot()})
         logger.info("=== 자동화 스크립트 완료 ===")
-        if driver:
-            try:
-                driver.quit()
-                logger.info("브라우저를 종료했습니다.")
-            except:
-                pass
 
 if __name__ == "__main__":
     success = main()
@@ -0,0 +1,228 @@
+"""
+예스파일 출석 흐름 벤치마크 (오프라인)
+
+로컬 테스트 서버(yesfile_mock_server.py)를 띄우고 실제 login_yesfile / check_attendance
+흐름을 headless 크롬으로 실행한다. 계정 수와 동시 실행 수 조합마다
+전체 소요 시간, 단계별 p50/p95, 최대 메모리(RSS)를 출력하고 JSON으로 저장한다.
+
+    python yesfile_benchmark.py --accounts 1 5 10 --concurrency 1 2 4 --latency-ms 50
+    python yesfile_benchmark.py --browser-profiles default lean   # 프로필별 시작 시간/메모리 비교
+    python yesfile_benchmark.py --baseline benchmark_prev.json   # 느려지면 종료 코드 1
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from yesfile_mock_server import add_fault_arguments, config_from_args, start_mock_server
+
+# 요약 표에 보여줄 단계 (나머지는 JSON에만 기록)
+KEY_STEPS = [
+    "driver_startup", "http_attendance", "login", "page_load:login",
+    "find:username", "find:password", "attendance", "page_load:event", "account",
+]
+
+class PeakMemorySampler(threading.Thread):
+    """일정 간격으로 프로세스 트리(이 프로세스 + 크롬) RSS를 재서 최대값 보관"""
+
+    def __init__(self, measure, interval=0.2):
+        super().__init__(name="memory-sampler", daemon=True)
+        self.measure = measure
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss_mb = self.measure()
+            if rss_mb:
+                self.peak_mb = max(self.peak_mb, rss_mb)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.peak_mb
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="예스파일 출석 흐름 벤치마크 (로컬 테스트 서버 사용)")
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1, 4], help="계정 수 목록")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2], help="동시 실행 수 목록")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread", help="실행 엔진")
+    parser.add_argument(
+        "--browser-profiles", nargs="+", choices=["default", "lean"], default=["default"],
+        help="비교할 브라우저 실행 프로필 (YESFILE_BROWSER_PROFILE)",
+    )
+    parser.add_argument("--http-mode", action="store_true", help="HTTP 직접 출석을 먼저 시도 (YESFILE_HTTP_MODE=1)")
+    parser.add_argument("--base-url", default=None, help="이미 떠 있는 서버 주소 (없으면 내장 테스트 서버 사용)")
+    parser.add_argument("--workdir", default=None, help="로그/기록 파일을 둘 폴더 (기본: 임시 폴더)")
+    parser.add_argument("--output", default="yesfile_benchmark.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON (느려지면 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용할 소요 시간 증가 비율")
+    parser.add_argument("--verbose", action="store_true", help="출석 스크립트 로그를 INFO로 출력")
+    add_fault_arguments(parser)
+    return parser.parse_args()
+
+def prepare_environment(args, base_url):
+    """출석 스크립트를 불러오기 전에 환경 변수와 작업 폴더 설정"""
+    os.environ["YESFILE_BASE_URL"] = base_url
+    os.environ["YESFILE_HEADLESS"] = "1"
+    os.environ["YESFILE_SESSION_TTL"] = "0"  # 매번 실제 로그인 측정
+    os.environ["YESFILE_RATE"] = "0"
+    os.environ.setdefault("YESFILE_DEBUG_CAPTURE", "off")
+    os.environ["YESFILE_HTTP_MODE"] = "1" if args.http_mode else "0"
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="yesfile-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    return workdir
+
+def run_scenario(yf, args, server, profile, account_count, concurrency):
+    """프로필/계정 수/동시 실행 수 조합 하나 실행 후 측정값 반환"""
+    os.environ["YESFILE_BROWSER_PROFILE"] = profile
+    if server is not None:
+        server.reset()
+    with yf._spans_lock:
+        yf._spans.clear()
+    with yf._driver_metrics_lock:
+        yf._driver_startup_times.clear()
+    # 앞 조합의 실패로 열린 차단기가 다음 조합을 보류시키지 않도록 조합마다 새로 만듦
+    with yf._circuit_breaker_lock:
+        yf._circuit_breaker = None
+
+    accounts = [
+        {"username": f"bench{account_count}x{concurrency}-{i}", "password": "benchpass"}
+        for i in range(account_count)
+    ]
+
+    baseline_mb = yf.process_tree_rss_mb(os.getpid()) or 0.0
+    sampler = PeakMemorySampler(lambda: yf.process_tree_rss_mb(os.getpid()))
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        if args.engine == "async":
+            results = asyncio.run(yf.run_async_batch(accounts, concurrency))
+        else:
+            results = yf.run_batch(accounts, concurrency)
+    finally:
+        wall = time.perf_counter() - started
+        peak_mb = sampler.stop()
+
+    with yf._spans_lock:
+        spans = list(yf._spans)
+    succeeded = sum(1 for r in results if r["success"])
+
+    # 브라우저 하나가 막 떴을 때의 RSS 평균과 동시 실행 중 브라우저당 RSS
+    startup_rss = [r["rss_mb"] for r in spans if r["step"] == "driver_startup" and "rss_mb" in r]
+    browsers = min(concurrency, account_count)
+    per_browser_mb = (peak_mb - baseline_mb) / browsers if startup_rss and peak_mb > baseline_mb else None
+    return {
+        "engine": args.engine,
+        "profile": profile,
+        "accounts": account_count,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall, 3),
+        "accounts_per_minute": round(account_count / wall * 60, 2) if wall else None,
+        "succeeded": succeeded,
+        "failed": account_count - succeeded,
+        "baseline_rss_mb": round(baseline_mb, 1),
+        "peak_rss_mb": round(peak_mb, 1),
+        "startup_rss_mb": round(sum(startup_rss) / len(startup_rss), 1) if startup_rss else None,
+        "rss_per_browser_mb": round(per_browser_mb, 1) if per_browser_mb else None,
+        "browsers_per_gb": round(1024 / per_browser_mb, 1) if per_browser_mb else None,
+        "steps": yf.summarize_spans(spans),
+        "requests": dict(server.request_counts) if server is not None else None,
+    }
+
+def print_scenario(result):
+    print(
+        f"\n[{result['engine']}/{result['profile']}] 계정 {result['accounts']}개 / 동시 {result['concurrency']}개: "
+        f"{result['wall_seconds']:.2f}초 ({result['accounts_per_minute']}개/분), "
+        f"성공 {result['succeeded']}, 실패 {result['failed']}, "
+        f"최대 RSS {result['peak_rss_mb']:.0f}MB (시작 {result['baseline_rss_mb']:.0f}MB)"
+    )
+    if result["rss_per_browser_mb"]:
+        print(
+            f"  브라우저당 RSS {result['rss_per_browser_mb']:.0f}MB "
+            f"(시작 직후 {result['startup_rss_mb']:.0f}MB), GB당 {result['browsers_per_gb']}개"
+        )
+    print(f"  {'단계':<20} {'횟수':>5} {'p50':>7} {'p95':>7} {'최대':>7}")
+    for step in KEY_STEPS:
+        stats = result["steps"].get(step)
+        if stats:
+            print(f"  {step:<20} {stats['count']:>5} {stats['p50']:>7.2f} {stats['p95']:>7.2f} {stats['max']:>7.2f}")
+
+def scenario_key(result):
+    return (result["engine"], result.get("profile", "default"), result["accounts"], result["concurrency"])
+
+def compare_with_baseline(results, baseline_path, tolerance):
+    """이전 결과보다 tolerance 이상 느려진 조합 목록"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {scenario_key(r): r for r in json.load(f)["scenarios"]}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(scenario_key(result))
+        if previous and result["wall_seconds"] > previous["wall_seconds"] * (1 + tolerance):
+            regressions.append((result, previous))
+    return regressions
+
+def main():
+    args = parse_args()
+    output_path = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        server = start_mock_server(config=config_from_args(args))
+        base_url = server.base_url
+
+    workdir = prepare_environment(args, base_url)
+    yf = importlib.import_module("yesfile_attendance_improved")
+    if not args.verbose:
+        yf.logger.setLevel("WARNING")
+    print(f"테스트 서버: {base_url}, 작업 폴더: {workdir}")
+
+    scenarios = []
+    try:
+        for profile in args.browser_profiles:
+            for account_count in args.accounts:
+                for concurrency in args.concurrency:
+                    if concurrency > account_count and concurrency != min(args.concurrency):
+                        continue
+                    result = run_scenario(yf, args, server, profile, account_count, concurrency)
+                    print_scenario(result)
+                    scenarios.append(result)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "base_url": base_url,
+            "scenarios": scenarios,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output_path}")
+
+    if baseline_path:
+        regressions = compare_with_baseline(scenarios, baseline_path, args.tolerance)
+        for result, previous in regressions:
+            print(
+                f"느려짐: [{result['engine']}/{result['profile']}] 계정 {result['accounts']}개 / 동시 {result['concurrency']}개 "
+                f"{previous['wall_seconds']:.2f}초 -> {result['wall_seconds']:.2f}초"
+            )
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
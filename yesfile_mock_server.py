@@ -0,0 +1,326 @@
+"""
+예스파일 로컬 테스트 서버 (표준 라이브러리만 사용)
+
+실제 사이트 대신 로그인 폼, 이벤트 페이지(#attendroulette > button),
+출석 성공/중복/로그인 실패 문구와 HTTP 출석 요청을 흉내낸다.
+지연 시간과 실패(503 응답, 응답 지연, 화면 구조 변경)를 넣을 수 있다.
+
+    python yesfile_mock_server.py --port 8800 --latency-ms 50
+    YESFILE_BASE_URL=http://127.0.0.1:8800 python yesfile_attendance_improved.py
+"""
+
+import argparse
+import html
+import logging
+import random
+import secrets
+import threading
+import time
+from datetime import date
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger("yesfile_mock_server")
+
+SESSION_COOKIE = "YF_SESSION"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko">
+<head><meta charset="utf-8"><title>{title} - 예스파일 (테스트 서버)</title></head>
+<body>
+<div id="header">{header}</div>
+<div id="content">{content}</div>
+</body>
+</html>
+"""
+
+LOGIN_FORM = """<form id="loginForm" method="post" action="/login">
+  <input type="hidden" name="csrf_token" value="{token}">
+  <input type="text" name="userid" id="userid" placeholder="아이디">
+  <input type="password" name="password" id="password" placeholder="비밀번호">
+  <button type="submit">로그인</button>
+</form>
+<script>
+function doLogin() {{ document.getElementById('loginForm').submit(); }}
+</script>
+"""
+
+ATTEND_WIDGET = """<div id="attendroulette"><button type="button" onclick="attend()">출석체크</button></div>
+<div id="attend-result" class="attend-result"></div>
+<script>
+function attend() {
+  fetch('/event/attendroulette', {method: 'POST', credentials: 'same-origin'})
+    .then(function (response) { return response.text(); })
+    .then(function (text) { document.getElementById('attend-result').textContent = text; });
+}
+</script>
+"""
+
+class MockConfig:
+    """지연/실패 주입 설정"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, fail_rate=0.0, hang_rate=0.0, hang_seconds=30.0,
+                 password=None, no_login_form=False, no_attend_button=False, anonymous_widget=True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.password = password
+        self.no_login_form = no_login_form
+        self.no_attend_button = no_attend_button
+        self.anonymous_widget = anonymous_widget
+
+class MockYesfileServer(ThreadingHTTPServer):
+    """세션/출석 기록을 메모리에 보관하는 테스트 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, address, config=None):
+        super().__init__(address, _MockHandler)
+        self.config = config or MockConfig()
+        self.lock = threading.Lock()
+        self.reset()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self):
+        """세션, 출석 기록, 요청 횟수 초기화"""
+        with self.lock:
+            self.sessions = {}
+            self.csrf_tokens = set()
+            self.attended = set()
+            self.request_counts = {}
+
+    def count_request(self, path):
+        with self.lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def check_password(self, password):
+        if self.config.password is not None:
+            return password == self.config.password
+        return bool(password) and password != "wrong"
+
+class _MockHandler(BaseHTTPRequestHandler):
+    server_version = "YesfileMock/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # === 공통 처리 ===
+
+    def _inject_faults(self):
+        """설정된 지연/실패 적용 (응답을 이미 보냈으면 True)"""
+        config = self.server.config
+        delay = config.latency_ms + (random.uniform(0, config.jitter_ms) if config.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if config.hang_rate and random.random() < config.hang_rate:
+            time.sleep(config.hang_seconds)
+        if config.fail_rate and random.random() < config.fail_rate:
+            self._send(503, "<h1>Service Unavailable</h1>")
+            return True
+        return False
+
+    def _send(self, status, body, headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _page(self, title, content, status=200):
+        username = self._current_user()
+        if username:
+            header = (
+                f'<span class="user">{html.escape(username)}님</span> '
+                f'<span class="point">1,000 P</span> <a href="/logout">로그아웃</a>'
+            )
+        else:
+            header = '<a href="/login">로그인</a>'
+        self._send(status, PAGE_TEMPLATE.format(title=title, header=header, content=content))
+
+    def _current_user(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if not morsel:
+            return None
+        with self.server.lock:
+            return self.server.sessions.get(morsel.value)
+
+    def _new_csrf_token(self):
+        token = secrets.token_hex(8)
+        with self.server.lock:
+            self.server.csrf_tokens.add(token)
+        return token
+
+    # === 요청 처리 ===
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        self.server.count_request(f"GET {path}")
+        if self._inject_faults():
+            return
+
+        if path == "/login":
+            self._login_page()
+        elif path == "/logout":
+            self._logout()
+        elif path == "/":
+            self._page("메인", "<h1>예스파일</h1>")
+        elif path == "/mypage":
+            if self._current_user():
+                self._page("마이페이지", "<h1>마이페이지</h1>")
+            else:
+                self._redirect("/login")
+        elif path in ("/event", "/event/"):
+            self._event_page()
+        else:
+            self._send(404, "<h1>Not Found</h1>")
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        self.server.count_request(f"POST {path}")
+        if self._inject_faults():
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+
+        if path == "/login":
+            self._login(form)
+        elif path == "/event/attendroulette":
+            self._attend()
+        else:
+            self._send(404, "<h1>Not Found</h1>")
+
+    def _login_page(self, error=None):
+        if self.server.config.no_login_form:
+            self._page("로그인", "<h1>로그인</h1><p>점검 중입니다.</p>")
+            return
+        message = f'<div class="alert" role="alert">{html.escape(error)}</div>' if error else ""
+        self._page("로그인", message + LOGIN_FORM.format(token=self._new_csrf_token()))
+
+    def _login(self, form):
+        with self.server.lock:
+            token_ok = form.get("csrf_token") in self.server.csrf_tokens
+            self.server.csrf_tokens.discard(form.get("csrf_token"))
+
+        username = form.get("userid", "")
+        if not token_ok or not username or not self.server.check_password(form.get("password", "")):
+            self._login_page("로그인 실패: 아이디를 확인하거나 비밀번호를 확인해주세요.")
+            return
+
+        session_id = secrets.token_hex(16)
+        with self.server.lock:
+            self.server.sessions[session_id] = username
+        self._redirect("/", {"Set-Cookie": f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly"})
+
+    def _logout(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        if morsel:
+            with self.server.lock:
+                self.server.sessions.pop(morsel.value, None)
+        self._redirect("/", {"Set-Cookie": f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
+
+    def _event_page(self):
+        # 출석 요청은 항상 로그인이 필요하고, 로그인 전 위젯 노출 여부는 anonymous_widget으로 선택
+        config = self.server.config
+        if config.no_attend_button:
+            self._page("이벤트", "<h1>이벤트</h1><p>진행 중인 이벤트가 없습니다.</p>")
+        elif not config.anonymous_widget and not self._current_user():
+            self._page("이벤트", '<h1>출석 룰렛</h1><p><a href="/login">로그인</a> 후 참여할 수 있습니다.</p>')
+        else:
+            self._page("이벤트", "<h1>출석 룰렛</h1>" + ATTEND_WIDGET)
+
+    def _attend(self):
+        username = self._current_user()
+        if not username:
+            self._send(401, "로그인이 필요합니다.")
+            return
+
+        key = (username, date.today().isoformat())
+        with self.server.lock:
+            already = key in self.server.attended
+            self.server.attended.add(key)
+
+        if already:
+            self._send(200, "이미 출석하셨습니다.")
+        else:
+            self._send(200, "출석체크 완료! 포인트가 적립되었습니다.")
+
+def start_mock_server(host="127.0.0.1", port=0, config=None):
+    """백그라운드 스레드에서 테스트 서버 시작 (port=0이면 빈 포트 사용)"""
+    server = MockYesfileServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="mock-server", daemon=True)
+    thread.start()
+    return server
+
+def add_fault_arguments(parser):
+    """지연/실패 주입 옵션 (벤치마크 스크립트와 공유)"""
+    parser.add_argument("--latency-ms", type=float, default=0, help="모든 응답에 더할 지연 시간(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="0~N ms 사이의 임의 지연 추가")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503으로 응답할 요청 비율 (0~1)")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="응답을 오래 지연시킬 요청 비율 (0~1)")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="지연시킬 때 멈추는 시간(초)")
+    parser.add_argument("--password", default=None, help="허용할 비밀번호 (없으면 'wrong' 외 모두 허용)")
+    parser.add_argument("--no-login-form", action="store_true", help="로그인 폼이 없는 화면 (구조 변경 흉내)")
+    parser.add_argument("--no-attend-button", action="store_true", help="출석 버튼이 없는 이벤트 화면")
+    parser.add_argument(
+        "--no-anonymous-widget", action="store_true",
+        help="로그인 전에는 출석 위젯을 숨김 (로그인 없이 하는 예열이 위젯을 찾지 못하는 경우)",
+    )
+
+def config_from_args(args):
+    return MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        fail_rate=args.fail_rate,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        password=args.password,
+        no_login_form=args.no_login_form,
+        no_attend_button=args.no_attend_button,
+        anonymous_widget=not args.no_anonymous_widget,
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="예스파일 로컬 테스트 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--verbose", action="store_true", help="요청마다 로그 출력")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+    )
+
+    server = MockYesfileServer((args.host, args.port), config_from_args(args))
+    logger.info(f"테스트 서버 시작: {server.base_url} (YESFILE_BASE_URL로 지정)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("테스트 서버 종료")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()